@@ -0,0 +1,45 @@
+from functools import wraps
+from flask import jsonify, session #type: ignore
+from supabase_client import supabase
+from resilience import call
+
+
+def get_current_user():
+    """Get current authenticated user from session"""
+    try:
+        # Check if we have the supabase auth token and restore session
+        if 'supabase.auth.token' in session:
+            token_data = session['supabase.auth.token']
+            if isinstance(token_data, dict) and 'access_token' in token_data:
+                call(supabase.auth.set_session, token_data['access_token'], token_data['refresh_token'], breaker='auth')
+        
+        user = call(supabase.auth.get_user, breaker='auth', read=True)
+        if user and user.user:
+            return user.user
+        else:
+            return None
+    except Exception as e:
+        print(f"Error getting current user: {str(e)}")
+        return None
+
+def ensure_supabase_session():
+    """Ensure Supabase session is set before database operations"""
+    if 'supabase.auth.token' in session:
+        token_data = session['supabase.auth.token']
+        if isinstance(token_data, dict) and 'access_token' in token_data and 'refresh_token' in token_data:
+            call(supabase.auth.set_session, token_data['access_token'], token_data['refresh_token'], breaker='auth')
+            return True
+    return False
+
+def require_auth(f):
+    """Decorator to require authentication for API endpoints"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        user = get_current_user()
+        if not user:
+            return jsonify({
+                'status': 'error',
+                'message': 'Authentication required'
+            }), 401
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,170 @@
+from flask import Blueprint, request, render_template, redirect, jsonify, session #type: ignore
+from supabase_client import supabase
+from resilience import call
+from auth_utils import get_current_user
+
+bp = Blueprint('auth', __name__)
+
+# MARK: GitHub OAuth
+@bp.route("/signin/github")
+def signin_with_github():
+    """Sign in with GitHub OAuth"""
+    try:
+        # Use the correct port (5524) for the redirect URL
+        redirect_url = f"{request.scheme}://{request.host}/callback"
+        print(f"Setting up GitHub OAuth with redirect URL: {redirect_url}")
+        
+        res = call(supabase.auth.sign_in_with_oauth, {
+            "provider": "github",
+            "options": {
+                "redirect_to": redirect_url
+            },
+        }, breaker='auth')
+        return redirect(res.url)
+    except Exception as e:
+        print(f"GitHub OAuth error: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'GitHub sign in error: {str(e)}'
+        }), 500
+
+@bp.route("/callback")
+def callback():
+    """Handle OAuth callback"""
+    print(f"=== CALLBACK DEBUG ===")
+    print(f"Request URL: {request.url}")
+    print(f"Request Host: {request.host}")
+    print(f"Request Args: {dict(request.args)}")
+    
+    try:
+        code = request.args.get("code")
+        next_url = request.args.get("next", "/")
+        
+        print(f"OAuth callback received - Code: {code[:20] if code else 'None'}...")
+        print(f"Next URL: {next_url}")
+
+        if code:
+            print("Exchanging code for session...")
+            res = call(supabase.auth.exchange_code_for_session, {"auth_code": code}, breaker='auth')
+            
+            if res.user:
+                print(f"User authenticated: {res.user.email}")
+                
+                # Store only basic user info in session for easy access
+                session['user_id'] = res.user.id
+                session['user_email'] = res.user.email
+                session['authenticated'] = True
+                
+                # Let FlaskSessionStorage handle the tokens automatically
+                print("FlaskSessionStorage should handle tokens automatically")
+                
+                print("Redirecting to home page...")
+                return redirect("/")
+            else:
+                print("No user returned from exchange")
+                return redirect("/login?error=auth_failed")
+        else:
+            print("No authorization code received")
+            return redirect("/login?error=no_code")
+            
+    except Exception as e:
+        print(f"OAuth callback error: {str(e)}")
+        return redirect("/login?error=auth_failed")
+
+# MARK: Login
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    """Login page and handler"""
+    if request.method == 'GET':
+        return render_template('login.html')
+    
+    elif request.method == 'POST':
+        try:
+            email = request.json.get('email')
+            password = request.json.get('password')
+            
+            response = call(supabase.auth.sign_in_with_password, {
+                "email": email,
+                "password": password
+            }, breaker='auth')
+            
+            if response.user:
+                session['user_id'] = response.user.id
+                session['user_email'] = response.user.email
+                session['authenticated'] = True
+                
+                # Store tokens for session restoration
+                if response.session:
+                    session['access_token'] = response.session.access_token
+                    session['refresh_token'] = response.session.refresh_token
+                    
+                    # Set the session on Supabase client
+                    call(
+                        supabase.auth.set_session,
+                        response.session.access_token, 
+                        response.session.refresh_token,
+                        breaker='auth'
+                    )
+                
+                return jsonify({
+                    'status': 'success',
+                    'message': 'Login successful',
+                    'user': {
+                        'id': response.user.id,
+                        'email': response.user.email
+                    }
+                })
+            else:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Login failed'
+                }), 401
+                
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Login error: {str(e)}'
+            }), 500
+
+# MARK: Logout
+@bp.route('/logout', methods=['POST'])
+def logout():
+    """Logout and clear session"""
+    try:
+        # Sign out from Supabase
+        call(supabase.auth.sign_out, breaker='auth')
+        
+        # Clear all session data including tokens
+        session.clear()
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Logout successful'
+        })
+    except Exception as e:
+        # Even if Supabase logout fails, clear local session
+        session.clear()
+        return jsonify({
+            'status': 'error',
+            'message': f'Logout error: {str(e)}'
+        }), 500
+
+# MARK: Auth Status
+@bp.route('/api/auth/status')
+def auth_status():
+    """Check authentication status"""
+    try:
+        user = get_current_user()
+        if user:
+            return jsonify({
+                'authenticated': True,
+                'user': {
+                    'id': user.id,
+                    'email': user.email,
+                    'username': user.user_metadata.get('username', user.email.split('@')[0])
+                }
+            })
+        else:
+            return jsonify({'authenticated': False})
+    except Exception as e:
+        return jsonify({'authenticated': False, 'error': str(e)})
@@ -0,0 +1,170 @@
+from flask import Blueprint, request, jsonify, session #type: ignore
+from supabase_client import supabase
+from models import COURSE_LIST
+from resilience import execute
+from auth_utils import get_current_user, require_auth
+import reminders
+
+bp = Blueprint('courses_api', __name__)
+
+# MARK: api/Courses
+@bp.route('/api/courses', methods=['GET', 'POST'])
+@require_auth
+def manage_courses():
+    """Get all courses or create a new course"""
+    if request.method == 'GET':
+        try:
+            # RLS Policy: Only returns courses where user_id = auth.uid()
+            # This automatically enforces security - users only see their own courses
+            query = supabase.table('courses').select(COURSE_LIST.columns)
+            if request.args.get('archived', 'false').lower() == 'true':
+                query = query.not_.is_('archived_at', 'null')
+            else:
+                query = query.is_('archived_at', 'null')
+            response = execute(query, read=True)
+            return jsonify({
+                'status': 'success',
+                'courses': [COURSE_LIST.row(course) for course in response.data]
+            })
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error fetching courses: {str(e)}'
+            }), 500
+    
+    elif request.method == 'POST':
+        try:
+            data = request.get_json()
+            course_name = data.get('courseName')
+            description = data.get('description', '')
+            
+            if not course_name:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Course name is required'
+                }), 400
+            
+            # Get current user ID for RLS
+            current_user = get_current_user()
+            if not current_user:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'User not authenticated'
+                }), 401
+            
+            course_data = {
+                'name': course_name,
+                'description': description,
+                'user_id': current_user.id
+            }
+            
+            # RLS Policy: user_id = auth.uid() check ensures this works
+            response = execute(supabase.table('courses').insert(course_data))
+            
+            if response.data:
+                created_course = response.data[0]
+                return jsonify({
+                    'status': 'success',
+                    'message': 'Course created successfully',
+                    'course': created_course
+                })
+            else:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Failed to create course - no data returned'
+                }), 400
+                
+        except Exception as e:
+            error_msg = str(e)
+            return jsonify({
+                'status': 'error',
+                'message': f'Error creating course: {error_msg}'
+            }), 500
+
+# MARK: api/Courses/<course_id>
+@bp.route('/api/courses/<course_id>', methods=['PUT', 'DELETE'])
+@require_auth
+def modify_course(course_id):
+    """Update or delete a course"""
+    if not course_id.isdigit():
+        return jsonify({
+            'status': 'error',
+            'message': 'Course id must be a number'
+        }), 400
+    
+    if request.method == 'PUT':
+        try:
+            data = request.get_json()
+            response = execute(supabase.table('courses').update(data).eq('id', course_id))
+            
+            return jsonify({
+                'status': 'success',
+                'message': 'Course updated successfully',
+                'course': response.data
+            })
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error updating course: {str(e)}'
+            }), 500
+    
+    elif request.method == 'DELETE':
+        try:
+            # Course and all of its tasks are removed in one transaction (see sql/course_operations.sql)
+            response = execute(supabase.rpc('delete_course_cascade', {'p_course_id': int(course_id)}))
+            reminders.scheduler.cancel_course(course_id)
+            
+            return jsonify({
+                'status': 'success',
+                'message': 'Course deleted successfully',
+                'tasks_deleted': response.data
+            })
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error deleting course: {str(e)}'
+            }), 500
+
+# MARK: api/Courses/<course_id>/archive
+@bp.route('/api/courses/<course_id>/archive', methods=['POST', 'DELETE'])
+@require_auth
+def archive_course(course_id):
+    """Archive a course (moving its tasks out of the active list) or restore it"""
+    if not course_id.isdigit():
+        return jsonify({
+            'status': 'error',
+            'message': 'Course id must be a number'
+        }), 400
+    
+    if request.method == 'POST':
+        try:
+            response = execute(supabase.rpc('archive_course', {'p_course_id': int(course_id)}))
+            reminders.scheduler.cancel_course(course_id)
+            
+            return jsonify({
+                'status': 'success',
+                'message': 'Course archived successfully',
+                'tasks_archived': response.data
+            })
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error archiving course: {str(e)}'
+            }), 500
+    
+    elif request.method == 'DELETE':
+        try:
+            response = execute(supabase.rpc('restore_course', {'p_course_id': int(course_id)}))
+            if response.data:
+                reminders.scheduler.schedule_many(response.data, session.get('user_id'))
+            
+            return jsonify({
+                'status': 'success',
+                'message': 'Course restored successfully',
+                'tasks_restored': len(response.data or [])
+            })
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error restoring course: {str(e)}'
+            }), 500
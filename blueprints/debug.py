@@ -0,0 +1,259 @@
+from flask import Blueprint, request, session #type: ignore
+from supabase_client import supabase
+from auth_utils import get_current_user
+
+# Debug-only routes; only registered when FLASK_DEBUG is enabled (see main.create_app)
+bp = Blueprint('debug', __name__)
+
+# Test route to verify callback URL
+@bp.route("/test-callback")
+def test_callback():
+    """Test route to verify the callback is working"""
+    return f"""
+    <h1>Callback Test</h1>
+    <p>Your Flask app is running correctly on {request.host}</p>
+    <p>Request URL: {request.url}</p>
+    <p>If you can see this, the port and routing are working!</p>
+    <a href="/login">Go to Login</a>
+    """
+
+# Debug route to check auth state
+@bp.route("/debug-auth")
+def debug_auth():
+    """Debug route to check authentication state"""
+    try:
+        # Check Flask session
+        flask_session_data = {
+            'user_id': session.get('user_id'),
+            'user_email': session.get('user_email'),
+            'authenticated': session.get('authenticated')
+        }
+        
+        # Check Supabase auth
+        supabase_user = supabase.auth.get_user()
+        supabase_auth_data = {
+            'user_exists': supabase_user.user is not None if supabase_user else False,
+            'user_id': supabase_user.user.id if supabase_user and supabase_user.user else None,
+            'user_email': supabase_user.user.email if supabase_user and supabase_user.user else None
+        }
+        
+        # Check get_current_user function
+        current_user = get_current_user()
+        current_user_data = {
+            'user_exists': current_user is not None,
+            'user_id': current_user.id if current_user else None,
+            'user_email': current_user.email if current_user else None
+        }
+        
+        return f"""
+        <h1>Authentication Debug</h1>
+        <h2>Flask Session:</h2>
+        <pre>{flask_session_data}</pre>
+        
+        <h2>Supabase Auth:</h2>
+        <pre>{supabase_auth_data}</pre>
+        
+        <h2>get_current_user():</h2>
+        <pre>{current_user_data}</pre>
+        
+        <a href="/courses">Go to Courses</a>
+        <br><a href="/debug-rls">Test RLS Policies</a>
+        """
+        
+    except Exception as e:
+        return f"<h1>Debug Error</h1><p>{str(e)}</p>"
+
+# Debug route to test RLS policies
+@bp.route("/debug-rls")
+def debug_rls():
+    """Debug route to test RLS policies"""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return "<h1>Not authenticated</h1><a href='/login'>Login</a>"
+        
+        results = {}
+        
+        # Test 1: Can we SELECT from courses?
+        try:
+            courses_select = supabase.table('courses').select('*').execute()
+            results['courses_select'] = {
+                'success': True,
+                'data': courses_select.data,
+                'count': len(courses_select.data)
+            }
+        except Exception as e:
+            results['courses_select'] = {
+                'success': False,
+                'error': str(e)
+            }
+        
+        # Test 2: Can we SELECT from tasks?
+        try:
+            tasks_select = supabase.table('tasks').select('*').execute()
+            results['tasks_select'] = {
+                'success': True,
+                'data': tasks_select.data,
+                'count': len(tasks_select.data)
+            }
+        except Exception as e:
+            results['tasks_select'] = {
+                'success': False,
+                'error': str(e)
+            }
+        
+        # Test 3: Try a simple INSERT to courses with explicit user_id
+        try:
+            test_course = {
+                'name': f'Test Course {current_user.id[:8]}',
+                'description': 'Test course for RLS debugging',
+                'user_id': current_user.id  # Explicit user_id, not relying on auth.uid()
+            }
+            
+            courses_insert = supabase.table('courses').insert(test_course).execute()
+            results['courses_insert'] = {
+                'success': True,
+                'data': courses_insert.data
+            }
+            
+            # Clean up the test course
+            if courses_insert.data:
+                supabase.table('courses').delete().eq('id', courses_insert.data[0]['id']).execute()
+                results['courses_insert']['cleaned_up'] = True
+                
+        except Exception as e:
+            results['courses_insert'] = {
+                'success': False,
+                'error': str(e)
+            }
+        
+        # Test 4: Check what auth.uid() returns from Flask app context
+        try:
+            # This won't work because we can't run raw SQL from supabase-py client
+            # But we can check if our user context is properly set
+            auth_check = supabase.auth.get_user()
+            results['auth_context'] = {
+                'user_authenticated': auth_check.user is not None,
+                'user_id': auth_check.user.id if auth_check.user else None,
+                'matches_current_user': auth_check.user.id == current_user.id if auth_check.user else False
+            }
+        except Exception as e:
+            results['auth_context'] = {
+                'success': False,
+                'error': str(e)
+            }
+        
+        return f"""
+        <h1>RLS Policy Debug</h1>
+        <h2>Current User: {current_user.email} (ID: {current_user.id})</h2>
+        
+        <h3>Test Results:</h3>
+        <pre>{results}</pre>
+        
+        <h3>Key Finding:</h3>
+        <p>auth.uid() returns NULL in SQL Editor because you're not authenticated there.</p>
+        <p>RLS policy is now correct: {'{authenticated}'} role</p>
+        <p>The issue was that auth.uid() needs to be called from an authenticated context (your Flask app).</p>
+        
+        <a href="/debug-auth">Back to Auth Debug</a>
+        <br><a href="/test-course-creation">Test Course Creation</a>
+        """
+        
+    except Exception as e:
+        return f"<h1>RLS Debug Error</h1><p>{str(e)}</p>"
+
+# Test route for course creation from authenticated context
+@bp.route("/test-course-creation")
+def test_course_creation():
+    """Test course creation from authenticated Flask context"""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return "<h1>Not authenticated</h1><a href='/login'>Login</a>"
+        
+        results = {}
+        
+        # Test 1: Check session storage contents
+        try:
+            session_keys = list(session.keys())
+            results['session_contents'] = {
+                'keys': session_keys,
+                'has_auth_data': any('supabase' in key.lower() or 'auth' in key.lower() for key in session_keys)
+            }
+        except Exception as e:
+            results['session_contents'] = {'error': str(e)}
+        
+        # Test 2: Try to refresh/restore the session before course creation
+        try:
+            # Force refresh the auth session
+            print("Attempting to refresh auth session...")
+            auth_response = supabase.auth.get_session()
+            print(f"Auth session: {auth_response}")
+            
+            results['session_refresh'] = {
+                'success': True,
+                'has_session': auth_response is not None,
+                'session_data': str(auth_response)[:200] if auth_response else None
+            }
+        except Exception as e:
+            results['session_refresh'] = {
+                'success': False,
+                'error': str(e)
+            }
+        
+        # Test 3: Try course creation with explicit session management
+        try:
+            test_course = {
+                'name': f'Flask Auth Test {current_user.id[:8]}',
+                'description': 'Testing course creation from Flask authenticated context',
+                'user_id': current_user.id
+            }
+            
+            print(f"Testing course creation with data: {test_course}")
+            
+            # Try to ensure we have a valid auth session
+            session_check = supabase.auth.get_user()
+            print(f"Pre-insert session check: {session_check}")
+            
+            response = supabase.table('courses').insert(test_course).execute()
+            
+            results['course_creation'] = {
+                'success': True,
+                'data': response.data,
+                'message': 'Course created successfully from Flask app!'
+            }
+            
+            # Clean up
+            if response.data:
+                delete_response = supabase.table('courses').delete().eq('id', response.data[0]['id']).execute()
+                results['cleanup'] = {
+                    'success': True,
+                    'message': 'Test course cleaned up'
+                }
+                
+        except Exception as e:
+            results['course_creation'] = {
+                'success': False,
+                'error': str(e),
+                'message': 'Course creation failed from Flask app'
+            }
+        
+        return f"""
+        <h1>Course Creation Test (Enhanced)</h1>
+        <h2>Testing from authenticated Flask context</h2>
+        <h3>User: {current_user.email}</h3>
+        
+        <h3>Results:</h3>
+        <pre>{results}</pre>
+        
+        <h3>Next Steps:</h3>
+        <p>1. Run the RLS bypass test in SQL Editor to confirm RLS is the issue</p>
+        <p>2. If RLS bypass works, we need to fix session handling</p>
+        <p>3. The issue is likely that auth.uid() returns NULL during database operations</p>
+        
+        <a href="/debug-rls">Back to RLS Debug</a>
+        <br><a href="/test-manual-session">Test Manual Session Restore</a>
+        """
+        
+    except Exception as e:
+        return f"<h1>Course Creation Test Error</h1><p>{str(e)}</p>"
@@ -0,0 +1,33 @@
+from flask import Blueprint, render_template, redirect, url_for #type: ignore
+from auth_utils import get_current_user
+
+bp = Blueprint('pages', __name__)
+
+# MARK: /
+@bp.route('/')
+def index():
+    """Main route - render template with user data if authenticated"""
+    user = get_current_user()
+    if not user:
+        return redirect(url_for('auth.login'))
+    
+    user_name = user.user_metadata.get('username', user.email.split('@')[0]) if user else 'Guest'
+    return render_template('index.html', name=user_name)
+
+# MARK: Courses
+@bp.route('/courses')
+def courses():
+    """Courses management page"""
+    user = get_current_user()
+    if not user:
+        return redirect(url_for('auth.login'))
+    return render_template('courses.html')
+
+# MARK: Tasks
+@bp.route('/tasks')
+def tasks():
+    """Tasks management page"""
+    user = get_current_user()
+    if not user:
+        return redirect(url_for('auth.login'))
+    return render_template('tasks.html')
@@ -0,0 +1,68 @@
+import os
+import threading
+import time
+from flask import Blueprint, jsonify #type: ignore
+from resilience import breaker_status, call
+
+bp = Blueprint('status', __name__)
+
+# Readiness results are reused for this long so frequent probes don't add Supabase load
+READY_CACHE_SECONDS = 5.0
+READY_TIMEOUT = 2.0
+
+_ready_cache = {'checked_at': 0.0, 'result': None}
+_ready_lock = threading.Lock()
+
+
+def _check_supabase():
+    """Ping the GoTrue health endpoint; it answers without touching any table"""
+    import httpx  # type: ignore
+
+    url = os.getenv('SUPABASE_URL', '').rstrip('/')
+    key = os.getenv('SUPABASE_KEY', '')
+    response = httpx.get(f'{url}/auth/v1/health', headers={'apikey': key}, timeout=READY_TIMEOUT)
+    response.raise_for_status()
+
+
+def supabase_ready():
+    """Cached Supabase reachability as (ok, error message)"""
+    with _ready_lock:
+        if _ready_cache['result'] and time.monotonic() - _ready_cache['checked_at'] < READY_CACHE_SECONDS:
+            return _ready_cache['result']
+        try:
+            call(_check_supabase, breaker='auth', timeout=READY_TIMEOUT)
+            result = (True, None)
+        except Exception as e:
+            result = (False, str(e) or type(e).__name__)
+        _ready_cache.update(checked_at=time.monotonic(), result=result)
+        return result
+
+# MARK: Health
+@bp.route('/healthz')
+def healthz():
+    """Liveness: the worker is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+# MARK: Ready
+@bp.route('/readyz')
+def readyz():
+    """Readiness: Supabase is reachable and no circuit breaker is open"""
+    ok, error = supabase_ready()
+    breakers = breaker_status()
+    ready = ok and all(b['state'] != 'open' for b in breakers.values())
+    return jsonify({
+        'status': 'ready' if ready else 'unavailable',
+        'supabase': {'reachable': ok, 'error': error},
+        'breakers': breakers
+    }), 200 if ready else 503
+
+# MARK: api/Status/Supabase
+@bp.route('/api/status/supabase')
+def supabase_status():
+    """Circuit breaker state for monitoring"""
+    breakers = breaker_status()
+    healthy = all(b['state'] != 'open' for b in breakers.values())
+    return jsonify({
+        'status': 'success' if healthy else 'degraded',
+        'breakers': breakers
+    }), 200 if healthy else 503
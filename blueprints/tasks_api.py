@@ -0,0 +1,413 @@
+from datetime import date, timedelta
+import heapq
+import os
+from flask import Blueprint, request, jsonify, session, Response, stream_with_context #type: ignore
+from supabase_client import supabase
+from models import COURSE_NAME, TASK_AGENDA, TASK_LIST
+from recurrence import parse_rule, occurrences
+from resilience import call, execute
+from auth_utils import get_current_user, require_auth
+import transfer
+import jobs
+import reminders
+
+bp = Blueprint('tasks_api', __name__)
+
+# Upper bound on the agenda window so recurring series can't be expanded without limit
+MAX_AGENDA_DAYS = 366
+
+# MARK: api/Tasks
+@bp.route('/api/tasks', methods=['GET', 'POST'])
+@require_auth
+def manage_tasks():
+    """Get all tasks or create a new task"""
+    if request.method == 'GET':
+        try:
+            # RLS Policy: Only returns tasks where the user owns the course
+            # Your policy checks: EXISTS(SELECT 1 FROM courses WHERE courses.id = tasks.course_id AND courses.user_id = auth.uid())
+            
+            response = execute(supabase.table('tasks').select(TASK_LIST.columns), read=True)
+            
+            # Course names come from one query rather than one per task
+            course_names = {}
+            if response.data:
+                course_response = execute(supabase.table('courses').select(COURSE_NAME.columns), read=True)
+                course_names = {course['id']: course['name'] for course in course_response.data}
+            
+            return jsonify({
+                'status': 'success',
+                'tasks': [TASK_LIST.row(task, course_name=course_names.get(task['course_id'], 'Unknown Course'))
+                          for task in response.data]
+            })
+        except Exception as e:
+            print(f"Tasks fetch error: {str(e)}")
+            return jsonify({
+                'status': 'error',
+                'message': f'Error fetching tasks: {str(e)}'
+            }), 500
+    
+    elif request.method == 'POST':
+        try:
+            data = request.get_json()
+            task_title = data.get('taskTitle')
+            notes = data.get('notes', '')
+            course_id = data.get('courseId')
+            due_date = data.get('dueDate')
+            priority = data.get('priority', 'medium')
+            completed = data.get('completed', "Not Started")
+            recurrence = data.get('recurrence') or None
+            
+            if not task_title:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Task title is required'
+                }), 400
+            
+            if not course_id:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Course assignment is required'
+                }), 400
+            
+            try:
+                parse_rule(recurrence)
+            except ValueError as e:
+                return jsonify({
+                    'status': 'error',
+                    'message': str(e)
+                }), 400
+            
+            # Validate that the user owns the course (extra security check)
+            current_user = get_current_user()
+            if not current_user:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'User not authenticated'
+                }), 401
+                
+            # Check if user owns the course before creating task; archived courses take no new tasks
+            course_check = execute(supabase.table('courses').select('id').eq('id', course_id).eq('user_id', current_user.id).is_('archived_at', 'null'), read=True)
+            if not course_check.data:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'You can only create tasks for your own active courses'
+                }), 403
+            
+            if not due_date:
+                # Default to tomorrow if not provided
+                tomorrow = date.fromordinal(date.today().toordinal() + 1)
+                due_date = tomorrow.isoformat()
+            
+            task_data = {
+                'title': task_title,
+                'notes': notes,
+                'course_id': int(course_id),
+                'due_date': due_date if due_date else None,
+                'priority': priority,
+                'completed': completed,
+                'recurrence': recurrence
+            }
+            
+            # RLS Policy will ensure user can only create tasks for courses they own
+            response = execute(supabase.table('tasks').insert(task_data))
+            
+            if response.data:
+                created_task = response.data[0]
+                reminders.scheduler.schedule(created_task, current_user.id)
+                return jsonify({
+                    'status': 'success',
+                    'message': 'Task created successfully',
+                    'task': created_task
+                })
+            else:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Failed to create task'
+                }), 400
+                
+        except Exception as e:
+            error_msg = str(e)
+            return jsonify({
+                'status': 'error',
+                'message': f'Error creating task: {error_msg}'
+            }), 500
+
+# MARK: api/Tasks/<task_id>
+@bp.route('/api/tasks/<task_id>', methods=['PUT', 'DELETE'])
+@require_auth
+def modify_task(task_id):
+    """Update or delete a task"""
+    if request.method == 'PUT':
+        try:
+            data = request.get_json()
+            
+            # Validate task exists first
+            task_check = execute(supabase.table('tasks').select('*').eq('id', task_id), read=True)
+            if not task_check.data:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Task not found'
+                }), 404
+            
+            # Prepare update data
+            update_data = {}
+            
+            # Handle different update scenarios
+            if 'completed' in data:
+                update_data['completed'] = bool(data['completed'])
+            
+            if 'title' in data:
+                update_data['title'] = data['title']
+            
+            if 'description' in data:
+                update_data['description'] = data['description']
+            
+            if 'priority' in data and data['priority'] in ['low', 'medium', 'high']:
+                update_data['priority'] = data['priority']
+            
+            if 'due_date' in data:
+                update_data['due_date'] = data['due_date']
+            
+            if 'recurrence' in data:
+                try:
+                    parse_rule(data['recurrence'])
+                except ValueError as e:
+                    return jsonify({
+                        'status': 'error',
+                        'message': str(e)
+                    }), 400
+                update_data['recurrence'] = data['recurrence'] or None
+            
+            if not update_data:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'No valid fields to update'
+                }), 400
+            
+            # Add updated timestamp
+            update_data['updated_at'] = 'now()'
+            
+            response = execute(supabase.table('tasks').update(update_data).eq('id', task_id))
+            
+            if response.data:
+                reminders.scheduler.schedule(response.data[0], session.get('user_id'))
+                return jsonify({
+                    'status': 'success',
+                    'message': 'Task updated successfully',
+                    'task': response.data[0]
+                })
+            else:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Failed to update task'
+                }), 400
+                
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error updating task: {str(e)}'
+            }), 500
+    
+    elif request.method == 'DELETE':
+        try:
+            response = execute(supabase.table('tasks').delete().eq('id', task_id))
+            reminders.scheduler.cancel(task_id)
+            
+            return jsonify({
+                'status': 'success',
+                'message': 'Task deleted successfully'
+            })
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error deleting task: {str(e)}'
+            }), 500
+
+# MARK: api/Agenda
+@bp.route('/api/agenda')
+@require_auth
+def agenda():
+    """Get tasks due within a date window, with recurring tasks expanded"""
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else date.today()
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else start + timedelta(days=7)
+    except ValueError:
+        return jsonify({
+            'status': 'error',
+            'message': 'from and to must be dates in YYYY-MM-DD format'
+        }), 400
+    
+    if end < start:
+        return jsonify({
+            'status': 'error',
+            'message': 'to must not be before from'
+        }), 400
+    
+    if (end - start).days > MAX_AGENDA_DAYS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Agenda range cannot exceed {MAX_AGENDA_DAYS} days'
+        }), 400
+    
+    try:
+        # One-off tasks are bounded and sorted by the database
+        single_response = execute(supabase.table('tasks').select(TASK_AGENDA.columns)
+            .is_('recurrence', 'null')
+            .gte('due_date', start.isoformat())
+            .lte('due_date', end.isoformat())
+            .order('due_date'), read=True)
+        
+        # Recurring series that started on or before the end of the window
+        # are expanded here rather than being stored one row per occurrence
+        series_response = execute(supabase.table('tasks').select(TASK_AGENDA.columns)
+            .not_.is_('recurrence', 'null')
+            .lte('due_date', end.isoformat()), read=True)
+        
+        course_response = execute(supabase.table('courses').select(COURSE_NAME.columns), read=True)
+        course_names = {course['id']: course['name'] for course in course_response.data}
+        
+        def project(task, recurring):
+            return TASK_AGENDA.row(task, course_name=course_names.get(task['course_id'], 'Unknown Course'), recurring=recurring)
+        
+        def expand(task, rule):
+            anchor = date.fromisoformat(task['due_date'][:10])
+            for day in occurrences(anchor, rule, start, end):
+                yield project(dict(task, due_date=day.isoformat()), True)
+        
+        streams = [[project(task, False) for task in single_response.data]]
+        for task in series_response.data:
+            try:
+                rule = parse_rule(task['recurrence'])
+            except ValueError as e:
+                print(f"Skipping task {task.get('id')} with invalid recurrence: {str(e)}")
+                continue
+            streams.append(expand(task, rule))
+        
+        items = list(heapq.merge(*streams, key=lambda t: t['due_date'][:10]))
+        
+        return jsonify({
+            'status': 'success',
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'tasks': items
+        })
+    except Exception as e:
+        print(f"Agenda fetch error: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Error fetching agenda: {str(e)}'
+        }), 500
+
+# MARK: api/Export
+@bp.route('/api/export')
+@require_auth
+def export_data():
+    """Stream the user's courses and tasks as CSV, NDJSON or iCalendar"""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in transfer.EXPORTERS:
+        return jsonify({
+            'status': 'error',
+            'message': f"Unsupported export format. Use one of: {', '.join(transfer.EXPORTERS)}"
+        }), 400
+    
+    mimetype, extension = transfer.EXPORT_FORMATS[fmt]
+    return Response(
+        stream_with_context(transfer.EXPORTERS[fmt](supabase)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=tasksmith-export.{extension}'}
+    )
+
+# MARK: api/Import
+@bp.route('/api/import', methods=['POST'])
+@require_auth
+def import_data():
+    """Bulk import tasks (and NDJSON course records) from an uploaded file"""
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({
+            'status': 'error',
+            'message': 'A file upload is required'
+        }), 400
+    
+    fmt = request.args.get('format') or upload.filename.rsplit('.', 1)[-1].lower()
+    if fmt == 'jsonl':
+        fmt = 'ndjson'
+    if fmt not in transfer.IMPORT_READERS:
+        return jsonify({
+            'status': 'error',
+            'message': f"Unsupported import format. Use one of: {', '.join(transfer.IMPORT_READERS)}"
+        }), 400
+    
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({
+                'status': 'error',
+                'message': 'User not authenticated'
+            }), 401
+        
+        # Large files would tie up this worker, so the import runs as a background job
+        auth_session = call(supabase.auth.get_session, breaker='auth', read=True)
+        upload_path = jobs.spool_upload(upload)
+        try:
+            job_id = jobs.queue.enqueue('import', current_user.id, {
+                'format': fmt,
+                'upload_path': upload_path,
+                'access_token': auth_session.access_token if auth_session else None
+            })
+        except Exception:
+            os.remove(upload_path)
+            raise
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Import started',
+            'job_id': job_id
+        }), 202
+    except jobs.QueueFull as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 503
+    except Exception as e:
+        print(f"Import error: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Error importing data: {str(e)}'
+        }), 500
+
+# MARK: api/Jobs/<job_id>
+@bp.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+@require_auth
+def job_status(job_id):
+    """Get progress of a background job or cancel it"""
+    current_user = get_current_user()
+    if not current_user:
+        return jsonify({
+            'status': 'error',
+            'message': 'User not authenticated'
+        }), 401
+    
+    if request.method == 'GET':
+        job = jobs.queue.get(job_id, current_user.id)
+        if not job:
+            return jsonify({
+                'status': 'error',
+                'message': 'Job not found'
+            }), 404
+        return jsonify({
+            'status': 'success',
+            'job': job
+        })
+    
+    elif request.method == 'DELETE':
+        if not jobs.queue.cancel(job_id, current_user.id):
+            return jsonify({
+                'status': 'error',
+                'message': 'Job not found'
+            }), 404
+        return jsonify({
+            'status': 'success',
+            'message': 'Cancellation requested',
+            'job': jobs.queue.get(job_id, current_user.id)
+        })
@@ -0,0 +1,477 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Job state lives in a local SQLite file so every gunicorn worker sees the same
+# jobs: any worker can report progress or accept a cancellation for a job that
+# another worker is running.
+JOB_DB_PATH = os.getenv('TASKSMITH_JOB_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobs.db'))
+JOB_UPLOAD_DIR = os.getenv('TASKSMITH_JOB_UPLOADS', os.path.join(os.path.dirname(JOB_DB_PATH), 'job_uploads'))
+JOB_WORKERS = int(os.getenv('TASKSMITH_JOB_WORKERS', '2'))
+JOB_MAX_PENDING = int(os.getenv('TASKSMITH_JOB_MAX_PENDING', '100'))
+JOB_MAX_ATTEMPTS = 3
+JOB_BACKOFF_BASE = 2.0
+JOB_BACKOFF_MAX = 60.0
+# An exiting worker waits this long for running jobs to reach a checkpoint;
+# kept under gunicorn's 30s timeout, after which the worker is killed
+JOB_SHUTDOWN_SECONDS = float(os.getenv('TASKSMITH_JOB_SHUTDOWN_SECONDS', '20'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+RETRYING = 'retrying'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Registered job handlers by kind, see job_handler()
+HANDLERS = {}
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler once cancellation has been requested"""
+
+
+class JobInterrupted(Exception):
+    """Raised inside a handler when the process running it is shutting down"""
+
+
+class JobFailed(Exception):
+    """Raised inside a handler for a failure that retrying can't fix"""
+
+
+class QueueFull(Exception):
+    """Raised when too many jobs are already waiting to run"""
+
+
+def job_handler(kind):
+    """Register a function(ctx, payload) as the handler for a job kind"""
+    def decorator(f):
+        HANDLERS[kind] = f
+        return f
+    return decorator
+
+
+def _process_started(pid):
+    """Start time of a process in clock ticks since boot, or None without /proc"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Fields after the command name, which may itself contain spaces; starttime is field 22
+    return int(stat.rsplit(')', 1)[1].split()[19])
+
+
+def _owner():
+    """Identify this process as a job owner: its pid plus its start time"""
+    pid = os.getpid()
+    return pid, _process_started(pid)
+
+
+def _owner_alive(pid, started):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    # A pid reused after a restart belongs to a process that started at a different time
+    return started is None or _process_started(pid) in (None, started)
+
+
+# MARK: Store
+class JobStore:
+    def __init__(self, path=JOB_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    checkpoint TEXT,
+                    owner_pid INTEGER,
+                    owner_started INTEGER,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            for column in ('owner_pid', 'owner_started'):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} INTEGER')
+
+    def _connect(self):
+        # One connection per thread; SQLite handles locking between processes
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def create(self, kind, user_id, payload, max_attempts):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, kind, user_id, status, payload, max_attempts, owner_pid, owner_started, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, kind, user_id, QUEUED, json.dumps(payload), max_attempts, *_owner(), now, now)
+            )
+        return job_id
+
+    def get(self, job_id):
+        row = self._connect().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        columns = ', '.join(f'{name} = ?' for name in fields)
+        with self._connect() as conn:
+            conn.execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*fields.values(), job_id))
+
+    def request_cancel(self, job_id):
+        """Flag a job for cancellation; queued jobs are cancelled immediately"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND status NOT IN (?, ?, ?)',
+                (time.time(), job_id, *FINISHED_STATES)
+            )
+            conn.execute(
+                'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)',
+                (CANCELLED, time.time(), job_id, QUEUED, RETRYING)
+            )
+
+    def claim(self, job_id, attempt):
+        """Mark a queued or retrying job as running; False if it was cancelled or already taken"""
+        with self._connect() as conn:
+            return conn.execute(
+                'UPDATE jobs SET status = ?, attempts = ?, owner_pid = ?, owner_started = ?, updated_at = ? '
+                'WHERE id = ? AND status IN (?, ?) AND cancel_requested = 0',
+                (RUNNING, attempt, *_owner(), time.time(), job_id, QUEUED, RETRYING)
+            ).rowcount == 1
+
+    def orphaned(self):
+        """Unfinished jobs whose owning process has exited"""
+        rows = self._connect().execute(
+            'SELECT * FROM jobs WHERE status IN (?, ?, ?)', (QUEUED, RUNNING, RETRYING)
+        ).fetchall()
+        return [dict(row) for row in rows if not _owner_alive(row['owner_pid'], row['owner_started'])]
+
+    def adopt(self, job, status):
+        """Take over an orphaned job; False if another process got to it first"""
+        with self._connect() as conn:
+            return conn.execute(
+                'UPDATE jobs SET status = ?, owner_pid = ?, owner_started = ?, updated_at = ? '
+                'WHERE id = ? AND status = ? AND owner_pid IS ? AND owner_started IS ?',
+                (status, *_owner(), time.time(), job['id'], job['status'], job['owner_pid'], job['owner_started'])
+            ).rowcount == 1
+
+    def count_pending(self):
+        row = self._connect().execute(
+            'SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)', (QUEUED, RETRYING)
+        ).fetchone()
+        return row[0]
+
+
+# MARK: Context
+class JobContext:
+    """Handle passed to job handlers for progress reporting and cancellation"""
+
+    # Seconds between cancellation checks against the store
+    CANCEL_CHECK_INTERVAL = 1.0
+
+    def __init__(self, store, job_id, user_id, stopping=None):
+        self.store = store
+        self.job_id = job_id
+        self.user_id = user_id
+        self.stopping = stopping
+        self._last_check = 0.0
+        self._cancelled = False
+
+    def progress(self, done, total=None, message=None):
+        fields = {'progress': done}
+        if total is not None:
+            fields['total'] = total
+        if message is not None:
+            fields['message'] = message
+        self.store.update(self.job_id, **fields)
+        self.raise_if_cancelled()
+        # Handlers report progress after saving a checkpoint, so this is a safe place to stop
+        if self.stopping is not None and self.stopping.is_set():
+            raise JobInterrupted()
+
+    @property
+    def cancelled(self):
+        now = time.monotonic()
+        if not self._cancelled and now - self._last_check >= self.CANCEL_CHECK_INTERVAL:
+            self._last_check = now
+            job = self.store.get(self.job_id)
+            self._cancelled = bool(job and job['cancel_requested'])
+        return self._cancelled
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    @property
+    def checkpoint(self):
+        """State saved by a previous attempt, so a retry can resume instead of redoing work"""
+        job = self.store.get(self.job_id)
+        return json.loads(job['checkpoint']) if job and job['checkpoint'] else None
+
+    def save_checkpoint(self, state):
+        self.store.update(self.job_id, checkpoint=json.dumps(state))
+
+
+# MARK: Queue
+class JobQueue:
+    def __init__(self, store=None, workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING):
+        self._store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._running = 0
+        self._idle = threading.Condition()
+
+    @property
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                self._store = JobStore()
+            return self._store
+
+    def _pool(self):
+        # Threads don't survive fork, so a preloaded app creates its pool lazily
+        # in each worker process on first use
+        with self._lock:
+            started = self._executor is None or self._pid != os.getpid()
+            if started:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+                self._pid = os.getpid()
+            executor = self._executor
+        if started:
+            self._recover()
+        return executor
+
+    def ensure_started(self):
+        """Create this process's pool, picking up jobs left behind by exited workers"""
+        self._pool()
+
+    def shutdown(self, timeout=JOB_SHUTDOWN_SECONDS):
+        """Stop running jobs at their next checkpoint, for a worker process that is exiting.
+
+        Interrupted jobs are put back without using up an attempt. They, and jobs
+        still queued or waiting to retry, keep this process as their owner, so the
+        next worker to start recovers them once this one has exited.
+        """
+        with self._lock:
+            executor = self._executor if self._pid == os.getpid() else None
+        if executor is None:
+            return
+        self._stopping.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._running and time.monotonic() < deadline:
+                self._idle.wait(deadline - time.monotonic())
+
+    def _submit(self, job_id):
+        # Retry timers may fire after shutdown; the job then waits for recovery
+        if not self._stopping.is_set():
+            self._pool().submit(self._run, job_id)
+
+    def _recover(self):
+        # Queued jobs and pending retries lived in the dead process's pool and
+        # timers; a running job was interrupted part way and resumes from its checkpoint
+        for job in self.store.orphaned():
+            if job['cancel_requested']:
+                if self.store.adopt(job, CANCELLED):
+                    self.store.update(job['id'], message='Cancelled')
+                    self._finish(job)
+                continue
+            if job['attempts'] >= job['max_attempts']:
+                if self.store.adopt(job, FAILED):
+                    self.store.update(job['id'], error='Worker exited during the last attempt')
+                    self._finish(job)
+                continue
+            if self.store.adopt(job, QUEUED if job['status'] == QUEUED else RETRYING):
+                print(f"Recovering job {job['id']} ({job['kind']}) left {job['status']} by process {job['owner_pid']}")
+                self._executor.submit(self._run, job['id'])
+
+    def enqueue(self, kind, user_id, payload, max_attempts=JOB_MAX_ATTEMPTS):
+        """Persist a job and schedule it; returns the job id without waiting"""
+        if kind not in HANDLERS:
+            raise ValueError(f'Unknown job kind: {kind}')
+        if self.store.count_pending() >= self.max_pending:
+            raise QueueFull('Too many jobs are waiting to run, try again later')
+
+        job_id = self.store.create(kind, user_id, payload, max_attempts)
+        self._pool().submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id, user_id):
+        """Return a job's public state if it belongs to the user"""
+        job = self.store.get(job_id)
+        if not job or job['user_id'] != user_id:
+            return None
+        return {
+            'id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'progress': job['progress'],
+            'total': job['total'],
+            'message': job['message'],
+            'attempts': job['attempts'],
+            'result': json.loads(job['result']) if job['result'] else None,
+            'error': job['error'],
+            'cancel_requested': bool(job['cancel_requested']),
+        }
+
+    def cancel(self, job_id, user_id):
+        job = self.store.get(job_id)
+        if not job or job['user_id'] != user_id:
+            return False
+        self.store.request_cancel(job_id)
+        job = self.store.get(job_id)
+        if job['status'] == CANCELLED:
+            # Jobs that never start again won't reach _finish from _run
+            self._finish(job)
+        return True
+
+    def _run(self, job_id):
+        with self._idle:
+            self._running += 1
+        try:
+            self._attempt(job_id)
+        finally:
+            with self._idle:
+                self._running -= 1
+                self._idle.notify_all()
+
+    def _attempt(self, job_id):
+        if self._stopping.is_set():
+            return
+        job = self.store.get(job_id)
+        if not job:
+            return
+        attempt = job['attempts'] + 1
+        if not self.store.claim(job_id, attempt):
+            return
+        ctx = JobContext(self.store, job_id, job['user_id'], self._stopping)
+
+        try:
+            result = HANDLERS[job['kind']](ctx, json.loads(job['payload']))
+        except JobCancelled:
+            self.store.update(job_id, status=CANCELLED, message='Cancelled')
+            self._finish(job)
+            return
+        except JobInterrupted:
+            # Not the job's fault, so the attempt is given back
+            self.store.update(job_id, status=RETRYING, attempts=attempt - 1, message='Waiting for another worker')
+            return
+        except Exception as e:
+            print(f"Job {job_id} ({job['kind']}) attempt {attempt} failed: {str(e)}")
+            if self.store.get(job_id)['cancel_requested']:
+                self.store.update(job_id, status=CANCELLED, message='Cancelled', error=str(e))
+                self._finish(job)
+            elif attempt < job['max_attempts'] and not isinstance(e, JobFailed):
+                delay = min(JOB_BACKOFF_MAX, JOB_BACKOFF_BASE * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)
+                owner_pid, owner_started = _owner()
+                self.store.update(job_id, status=RETRYING, error=str(e), owner_pid=owner_pid, owner_started=owner_started)
+                timer = threading.Timer(delay, self._submit, (job_id,))
+                timer.daemon = True
+                timer.start()
+            else:
+                self.store.update(job_id, status=FAILED, error=str(e))
+                self._finish(job)
+            return
+
+        self.store.update(job_id, status=SUCCEEDED, error=None, result=json.dumps(result, default=str))
+        self._finish(job)
+
+    def _finish(self, job):
+        """Drop the spooled upload and stored token once a job can no longer run"""
+        payload = json.loads(job['payload'])
+        path = payload.pop('upload_path', None)
+        if path and os.path.exists(path):
+            os.remove(path)
+        payload.pop('access_token', None)
+        self.store.update(job['id'], payload=json.dumps(payload))
+
+
+def spool_upload(file_storage):
+    """Save an uploaded file to disk so a job can read it after the request ends"""
+    os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(JOB_UPLOAD_DIR, uuid.uuid4().hex)
+    file_storage.save(path)
+    return path
+
+
+queue = JobQueue()
+
+
+# MARK: Handlers
+@job_handler('import')
+def run_import(ctx, payload):
+    """Import an uploaded file as the user who started the job"""
+    import transfer
+    import reminders
+    from resilience import is_auth_error
+    from supabase_client import create_user_client
+
+    client = create_user_client(payload['access_token'])
+    checkpoint = ctx.checkpoint
+    resume = transfer.ImportResult.from_checkpoint(checkpoint) if checkpoint else None
+
+    def on_progress(result):
+        ctx.save_checkpoint(result.to_checkpoint())
+        ctx.progress(result.last_line, message=f'Imported {result.imported} tasks')
+
+    with open(payload['upload_path'], 'rb') as f:
+        # Supabase outages propagate from here so the job is retried, resuming after
+        # the last completed batch with the course id remaps it had built; rows are
+        # keyed by job id and line, so a batch that did commit isn't stored twice
+        try:
+            result = transfer.import_records(
+                client, ctx.user_id, transfer.IMPORT_READERS[payload['format']](f),
+                on_progress=on_progress,
+                on_inserted=lambda rows: reminders.scheduler.schedule_many(rows, ctx.user_id),
+                resume=resume,
+                import_id=ctx.job_id
+            )
+        except Exception as e:
+            # Only the access token is stored (refreshing would rotate the user's
+            # refresh token), so once it expires no retry can succeed
+            if is_auth_error(e):
+                done = ctx.checkpoint or {}
+                raise JobFailed(f"Your session expired after {done.get('last_line', 0)} lines "
+                                f"({done.get('imported', 0)} tasks imported); sign in and import the rest again")
+            raise
+
+    return result.to_dict()
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+# Task and course schemas, and the projections endpoints serialize them with.
+# Request handlers select only a projection's columns and project the rows they
+# get back in place; converting short-lived rows to objects first costs more
+# than it saves. The slotted classes are for rows held for a long time, such as
+# the reminder heap, where they take about a quarter of the memory of a dict.
+
+
+@dataclass(slots=True)
+class Task:
+    id: int
+    course_id: int | None = None
+    title: str = ''
+    notes: str | None = None
+    due_date: str | None = None
+    priority: str | None = None
+    completed: str | bool | None = None
+    recurrence: str | None = None
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            row['id'],
+            row.get('course_id'),
+            row.get('title') or '',
+            row.get('notes'),
+            row.get('due_date'),
+            row.get('priority'),
+            row.get('completed'),
+            row.get('recurrence'),
+        )
+
+
+@dataclass(slots=True)
+class Course:
+    id: int
+    name: str = ''
+    description: str | None = None
+    user_id: str | None = None
+    archived_at: str | None = None
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            row['id'],
+            row.get('name') or '',
+            row.get('description'),
+            row.get('user_id'),
+            row.get('archived_at'),
+        )
+
+
+class Projection:
+    """The subset of a model's fields one endpoint sends back.
+
+    Names that aren't model fields (such as course_name) are computed by the
+    caller and passed as keyword arguments when projecting.
+    """
+
+    def __init__(self, model, field_names):
+        model_fields = {f.name for f in fields(model)}
+        self.model = model
+        self.field_names = tuple(field_names)
+        self.model_fields = tuple(name for name in self.field_names if name in model_fields)
+        self.extra_fields = tuple(name for name in self.field_names if name not in model_fields)
+        self._field_set = frozenset(self.field_names)
+        self._get = attrgetter(*self.model_fields)
+
+    @property
+    def columns(self):
+        """Column list for a Supabase select that fetches only what this projection needs"""
+        return ', '.join(self.model_fields)
+
+    def row(self, row, **extra):
+        """Project a row fetched with `columns`, reusing the row's dict"""
+        # Rows selected with `columns` already match, so only strays need removing
+        if len(row) != len(self.model_fields):
+            for name in row.keys() - self._field_set:
+                del row[name]
+        for name in self.extra_fields:
+            row[name] = extra[name]
+        return row
+
+    def __call__(self, obj, **extra):
+        values = self._get(obj)
+        data = dict(zip(self.model_fields, values if len(self.model_fields) > 1 else (values,)))
+        for name in self.extra_fields:
+            data[name] = extra[name]
+        return data
+
+
+TASK_LIST = Projection(Task, ('id', 'course_id', 'course_name', 'title', 'notes', 'due_date', 'priority', 'completed', 'recurrence'))
+TASK_AGENDA = Projection(Task, ('id', 'course_id', 'course_name', 'title', 'due_date', 'priority', 'completed', 'recurrence', 'recurring'))
+TASK_EXPORT = Projection(Task, ('id', 'course_id', 'course_name', 'title', 'notes', 'due_date', 'priority', 'completed', 'recurrence'))
+TASK_REMINDER = Projection(Task, ('id', 'course_id', 'title', 'due_date', 'recurrence', 'completed'))
+COURSE_LIST = Projection(Course, ('id', 'name', 'description', 'user_id', 'archived_at'))
+COURSE_NAME = Projection(Course, ('id', 'name'))
@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+# Recurrence rules are stored on the task row as a short string. The simple
+# presets map onto a small subset of the iCalendar RRULE syntax, which is also
+# accepted directly for custom rules, e.g. "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE".
+PRESETS = {
+    'daily': 'FREQ=DAILY',
+    'weekly': 'FREQ=WEEKLY',
+}
+
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+
+@dataclass(frozen=True)
+class Rule:
+    freq: str
+    interval: int = 1
+    byday: tuple = ()
+    count: int | None = None
+    until: date | None = None
+
+    def to_rrule(self) -> str:
+        """Render the rule back to RRULE syntax"""
+        parts = [f'FREQ={self.freq}']
+        if self.interval != 1:
+            parts.append(f'INTERVAL={self.interval}')
+        if self.byday:
+            parts.append('BYDAY=' + ','.join(WEEKDAYS[d] for d in self.byday))
+        if self.count is not None:
+            parts.append(f'COUNT={self.count}')
+        if self.until is not None:
+            parts.append(f'UNTIL={self.until.strftime("%Y%m%d")}')
+        return ';'.join(parts)
+
+
+def _parse_date(value: str) -> date:
+    value = value.strip()
+    if len(value) >= 8 and value[:8].isdigit():
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    return date.fromisoformat(value[:10])
+
+
+def parse_rule(text: str | None) -> Rule | None:
+    """Parse a stored recurrence string; returns None for one-off tasks"""
+    if text is None:
+        return None
+    # Values come straight from request JSON, which may hold any type
+    if not isinstance(text, str):
+        raise ValueError('Recurrence must be a string such as "weekly" or an RRULE')
+    if not text.strip():
+        return None
+
+    text = PRESETS.get(text.strip().lower(), text.strip())
+    if text.upper().startswith('RRULE:'):
+        text = text[6:]
+
+    fields = {}
+    for part in text.split(';'):
+        if not part:
+            continue
+        if '=' not in part:
+            raise ValueError(f'Invalid recurrence rule part: {part}')
+        key, value = part.split('=', 1)
+        fields[key.strip().upper()] = value.strip()
+
+    freq = fields.pop('FREQ', '').upper()
+    if freq not in ('DAILY', 'WEEKLY'):
+        raise ValueError('Recurrence frequency must be DAILY or WEEKLY')
+
+    try:
+        interval = int(fields.pop('INTERVAL', 1))
+        count = int(fields['COUNT']) if 'COUNT' in fields else None
+        until = _parse_date(fields['UNTIL']) if 'UNTIL' in fields else None
+    except ValueError:
+        raise ValueError('Invalid INTERVAL, COUNT or UNTIL in recurrence rule')
+    fields.pop('COUNT', None)
+    fields.pop('UNTIL', None)
+
+    if interval < 1:
+        raise ValueError('Recurrence interval must be at least 1')
+    if count is not None and count < 1:
+        raise ValueError('Recurrence count must be at least 1')
+
+    byday = ()
+    if 'BYDAY' in fields:
+        if freq != 'WEEKLY':
+            raise ValueError('BYDAY is only supported for WEEKLY rules')
+        days = [d.strip().upper() for d in fields.pop('BYDAY').split(',') if d.strip()]
+        if not days or any(d not in WEEKDAYS for d in days):
+            raise ValueError('BYDAY must list weekdays such as MO,WE,FR')
+        byday = tuple(sorted({WEEKDAYS.index(d) for d in days}))
+
+    if fields:
+        raise ValueError(f'Unsupported recurrence fields: {", ".join(sorted(fields))}')
+
+    return Rule(freq=freq, interval=interval, byday=byday, count=count, until=until)
+
+
+def occurrences(anchor: date, rule: Rule, start: date, end: date):
+    """Yield the dates of a series that fall within [start, end], in order.
+
+    The first occurrence inside the window is computed arithmetically from the
+    anchor (the task's due date), so the cost is proportional to the window and
+    not to how long the series has been running.
+    """
+    if rule.until is not None and rule.until < end:
+        end = rule.until
+    if end < anchor or end < start:
+        return
+
+    if rule.freq == 'DAILY':
+        step = rule.interval
+        offset = max(0, (start - anchor).days)
+        index = -(-offset // step)
+        current = anchor + timedelta(days=index * step)
+        while current <= end:
+            if rule.count is not None and index >= rule.count:
+                return
+            yield current
+            index += 1
+            current += timedelta(days=step)
+        return
+
+    # WEEKLY: periods are blocks of `interval` weeks starting from the
+    # Monday of the anchor's week.
+    days = rule.byday or (anchor.weekday(),)
+    week0 = anchor - timedelta(days=anchor.weekday())
+    first_days = [d for d in days if d >= anchor.weekday()]
+    period_len = 7 * rule.interval
+
+    period = max(0, (start - week0).days // period_len)
+    while True:
+        period_start = week0 + timedelta(days=period * period_len)
+        if period_start > end:
+            return
+        for position, weekday in enumerate(first_days if period == 0 else days):
+            current = period_start + timedelta(days=weekday)
+            if period == 0:
+                index = position
+            else:
+                index = len(first_days) + (period - 1) * len(days) + position
+            if rule.count is not None and index >= rule.count:
+                return
+            if current > end:
+                return
+            if current >= start:
+                yield current
+        period += 1
+
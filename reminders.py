@@ -0,0 +1,396 @@
+import fcntl
+import heapq
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+
+from models import Task, TASK_REMINDER
+from recurrence import parse_rule, occurrences
+from resilience import execute
+
+# Reminders fire this long before REMINDER_TIME on the due date
+REMINDER_LEAD_HOURS = float(os.getenv('TASKSMITH_REMINDER_LEAD_HOURS', '24'))
+REMINDER_TIME = os.getenv('TASKSMITH_REMINDER_TIME', '09:00')
+
+# One-off due dates this far ahead are held in memory; the window is extended a day at a time.
+# Recurring series always keep their next occurrence queued, however far off it is.
+REMINDER_HORIZON_DAYS = int(os.getenv('TASKSMITH_REMINDER_HORIZON_DAYS', '3'))
+REMINDER_LOAD_PAGE_SIZE = 1000
+
+# How often the scheduler thread picks up changes written by other workers
+OUTBOX_POLL_SECONDS = 2.0
+
+REMINDER_DB_PATH = os.getenv('TASKSMITH_REMINDER_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reminders.db'))
+
+# Task statuses that no longer need a reminder
+DONE_STATUSES = {'Submitted', 'Mark Received', True}
+
+
+def _fire_time(due):
+    hour, minute = (int(part) for part in REMINDER_TIME.split(':'))
+    return datetime(due.year, due.month, due.day, hour, minute).timestamp() - REMINDER_LEAD_HOURS * 3600
+
+
+def next_due(task, on_or_after, anchor=None):
+    """Return the next due date of a task on or after a date, or None"""
+    anchor = anchor or task.due_date
+    if not anchor or task.completed in DONE_STATUSES:
+        return None
+    anchor = date.fromisoformat(str(anchor)[:10])
+    try:
+        rule = parse_rule(task.recurrence)
+    except ValueError:
+        rule = None
+    if rule is None:
+        return anchor if anchor >= on_or_after else None
+    # The next occurrence is within one period of the later of the anchor and on_or_after
+    start = max(anchor, on_or_after)
+    span = timedelta(days=7 * rule.interval + 7)
+    return next(occurrences(anchor, rule, start, start + span), None)
+
+
+def _outbox_payload(row, user_id):
+    return json.dumps(dict(TASK_REMINDER(Task.from_row(row)), user_id=user_id))
+
+
+def _notification(task, user_id):
+    return {
+        'task_id': task.id,
+        'user_id': user_id,
+        'course_id': task.course_id,
+        'title': task.title,
+        'due_date': task.due_date,
+    }
+
+
+# MARK: Notifiers
+class LogNotifier:
+    """Default notifier; writes reminders to the log"""
+
+    def send(self, reminder):
+        print(f"Reminder: task {reminder['task_id']} '{reminder['title']}' is due {reminder['due_date']}")
+
+
+class MemoryNotifier:
+    """Collects reminders in a list instead of delivering them, for tests"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, reminder):
+        self.sent.append(reminder)
+
+
+def load_notifier(spec=None):
+    """Build the notifier named by TASKSMITH_NOTIFIER ('module:Class'), defaulting to LogNotifier"""
+    spec = spec or os.getenv('TASKSMITH_NOTIFIER')
+    if not spec:
+        return LogNotifier()
+    module_name, _, class_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# MARK: Queue
+class ReminderQueue:
+    """Min-heap of upcoming reminders keyed by fire time.
+
+    Rescheduling or cancelling a task doesn't search the heap: the task's
+    entry in `entries` is replaced or removed and the stale heap item is
+    skipped when it reaches the top. The heap is rebuilt once stale items
+    outnumber live ones, so memory stays proportional to live reminders.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.entries = {}
+        self.by_course = {}
+        self._seq = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, task, user_id, anchor, fire_at):
+        # Ids arrive as ints from Supabase rows and as strings from URLs
+        task_id = str(task.id)
+        self.remove(task_id)
+        self._seq += 1
+        entry = (fire_at, self._seq, task, user_id, anchor)
+        self.entries[task_id] = entry
+        self.by_course.setdefault(str(task.course_id), set()).add(task_id)
+        heapq.heappush(self.heap, entry)
+
+    def remove(self, task_id):
+        entry = self.entries.pop(str(task_id), None)
+        if entry is None:
+            return
+        course_id = str(entry[2].course_id)
+        course_tasks = self.by_course.get(course_id)
+        if course_tasks is not None:
+            course_tasks.discard(str(task_id))
+            if not course_tasks:
+                del self.by_course[course_id]
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self.entries):
+            self.heap = list(self.entries.values())
+            heapq.heapify(self.heap)
+
+    def remove_course(self, course_id):
+        for task_id in list(self.by_course.get(str(course_id), ())):
+            self.remove(task_id)
+
+    def next_fire_time(self):
+        self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        """Remove and return (task, user_id, anchor) for every reminder whose fire time has passed"""
+        due = []
+        self._drop_stale()
+        while self.heap and self.heap[0][0] <= now:
+            _, _, task, user_id, anchor = heapq.heappop(self.heap)
+            self.remove(task.id)
+            due.append((task, user_id, anchor))
+            self._drop_stale()
+        return due
+
+    def _drop_stale(self):
+        while self.heap and self.entries.get(str(self.heap[0][2].id)) is not self.heap[0]:
+            heapq.heappop(self.heap)
+
+
+# MARK: Scheduler
+class ReminderScheduler:
+    """Fires due-date reminders from one worker process.
+
+    Request handlers on any gunicorn worker record task changes in a local
+    SQLite outbox. The worker holding the lock file runs the scheduler
+    thread, which applies those changes to its in-memory queue and sleeps
+    until the next reminder is due, so Supabase is only read when the
+    loading window moves forward.
+    """
+
+    def __init__(self, notifier=None, loader=None, path=REMINDER_DB_PATH):
+        self.notifier = notifier or load_notifier()
+        self.loader = loader
+        self.path = path
+        self.queue = ReminderQueue()
+        self.loaded_until = None
+        self._local = threading.local()
+        self._wake = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._lock_file = None
+        self._last_seq = 0
+        self._stopped = False
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS outbox (seq INTEGER PRIMARY KEY AUTOINCREMENT, op TEXT NOT NULL, key TEXT NOT NULL, payload TEXT)')
+            conn.execute('CREATE TABLE IF NOT EXISTS sent (task_id TEXT NOT NULL, due_date TEXT NOT NULL, PRIMARY KEY (task_id, due_date))')
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    # Called from request handlers
+    def schedule(self, task, user_id=None):
+        """Record a created or updated task so its reminder is (re)scheduled"""
+        self._record('schedule', task['id'], _outbox_payload(task, user_id))
+
+    def schedule_many(self, tasks, user_id=None):
+        """Record several new tasks in one outbox write, e.g. after a bulk import"""
+        if self.loader is None:
+            return
+        self.ensure_started()
+        with self._connect() as conn:
+            conn.executemany('INSERT INTO outbox (op, key, payload) VALUES (?, ?, ?)',
+                             [('schedule', json.dumps(task['id']), _outbox_payload(task, user_id)) for task in tasks])
+        with self._wake:
+            self._wake.notify()
+
+    def cancel(self, task_id):
+        self._record('cancel', task_id)
+
+    def cancel_course(self, course_id):
+        self._record('cancel_course', course_id)
+
+    def _record(self, op, key, payload=None):
+        if self.loader is None:
+            return
+        self.ensure_started()
+        with self._connect() as conn:
+            conn.execute('INSERT INTO outbox (op, key, payload) VALUES (?, ?, ?)',
+                         (op, json.dumps(key), payload))
+        with self._wake:
+            self._wake.notify()
+
+    # Scheduler thread
+    def ensure_started(self):
+        """Start the scheduler thread in this process if it isn't running (fork-safe)"""
+        # Without a loader a new leader couldn't rebuild the queue, so reminders are off
+        if self.loader is None:
+            return
+        # Called from every request thread; one scheduler thread per process, since
+        # flock on the shared lock file would let a second one become leader too
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='reminders', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """Stop the scheduler thread and give up leadership, so another worker takes over"""
+        self._stopped = True
+        with self._wake:
+            self._wake.notify()
+        if self._thread and self._pid == os.getpid():
+            self._thread.join(timeout)
+        if self._lock_file is not None:
+            # Closing the file releases the flock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _acquire_leadership(self):
+        if self._lock_file is None:
+            self._lock_file = open(self.path + '.lock', 'w')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _run(self):
+        while not self._stopped and not self._acquire_leadership():
+            time.sleep(OUTBOX_POLL_SECONDS * 5)
+        if self._stopped:
+            return
+
+        # Changes recorded before we became leader are covered by the initial load
+        row = self._connect().execute('SELECT MAX(seq) FROM outbox').fetchone()
+        self._last_seq = row[0] or 0
+
+        while not self._stopped:
+            try:
+                # Retried on the next pass if Supabase fails part way through
+                if self.loaded_until is None or date.today() + timedelta(days=REMINDER_HORIZON_DAYS) > self.loaded_until:
+                    self._extend_window()
+                self._drain_outbox()
+                self._fire_due(time.time())
+            except Exception as e:
+                print(f"Reminder scheduler error: {str(e)}")
+
+            next_fire = self.queue.next_fire_time()
+            timeout = OUTBOX_POLL_SECONDS
+            if next_fire is not None:
+                timeout = max(0.0, min(timeout, next_fire - time.time()))
+            with self._wake:
+                self._wake.wait(timeout)
+
+    def _drain_outbox(self):
+        conn = self._connect()
+        rows = conn.execute('SELECT seq, op, key, payload FROM outbox WHERE seq > ? ORDER BY seq', (self._last_seq,)).fetchall()
+        for seq, op, key, payload in rows:
+            key = json.loads(key)
+            if op == 'schedule':
+                payload = json.loads(payload)
+                self.add(Task.from_row(payload), payload.get('user_id'))
+            elif op == 'cancel':
+                self.queue.remove(key)
+            elif op == 'cancel_course':
+                self.queue.remove_course(key)
+            self._last_seq = seq
+        if rows:
+            with conn:
+                conn.execute('DELETE FROM outbox WHERE seq <= ?', (self._last_seq,))
+
+    def add(self, task, user_id, anchor=None, today=None):
+        """Put a task's next reminder on the queue, replacing any existing one"""
+        today = today or date.today()
+        # Recurring series keep their original due date as the anchor for expansion
+        anchor = anchor or task.due_date
+        due = next_due(task, today, anchor)
+        past_window = self.loaded_until is not None and due is not None and due > self.loaded_until
+        if due is None or (past_window and not task.recurrence):
+            # One-off reminders past the window are loaded when the window reaches them;
+            # series are only loaded once, so they stay queued
+            self.queue.remove(task.id)
+            return
+        self.queue.add(replace(task, due_date=due.isoformat()), user_id, anchor, _fire_time(due))
+
+    def _extend_window(self):
+        start = self.loaded_until + timedelta(days=1) if self.loaded_until else None
+        until = date.today() + timedelta(days=REMINDER_HORIZON_DAYS)
+        # Collected first: add() checks rows against the new window, which must
+        # only be recorded once every row has arrived
+        loaded = list(self.loader(start, until))
+        self.loaded_until = until
+        for task, user_id in loaded:
+            self.add(task, user_id)
+
+    def _fire_due(self, now):
+        conn = self._connect()
+        for task, user_id, anchor in self.queue.pop_due(now):
+            with conn:
+                inserted = conn.execute('INSERT OR IGNORE INTO sent (task_id, due_date) VALUES (?, ?)',
+                                        (str(task.id), task.due_date)).rowcount
+            if inserted:
+                try:
+                    self.notifier.send(_notification(task, user_id))
+                except Exception as e:
+                    print(f"Reminder delivery failed for task {task.id}: {str(e)}")
+            if task.recurrence:
+                # Queue the series' next occurrence
+                after = date.fromisoformat(task.due_date) + timedelta(days=1)
+                self.add(task, user_id, anchor, today=after)
+        with conn:
+            conn.execute('DELETE FROM sent WHERE due_date < ?', ((date.today() - timedelta(days=2)).isoformat(),))
+
+
+def supabase_loader(start, until):
+    """Load reminders from Supabase with the service key, a page at a time.
+
+    The first call (start is None) loads every recurring series plus one-off
+    tasks due up to `until`; later calls only load the newly added days.
+    Yields (Task, user_id) pairs.
+    """
+    from supabase_client import create_service_client
+
+    client = create_service_client()
+    columns = f'{TASK_REMINDER.columns}, courses(user_id)'
+    first_day = start or date.today()
+
+    def pages(build):
+        last_id = None
+        while True:
+            query = build(client.table('tasks').select(columns))
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            page = execute(query.order('id').limit(REMINDER_LOAD_PAGE_SIZE), read=True).data
+            yield from page
+            if len(page) < REMINDER_LOAD_PAGE_SIZE:
+                return
+            last_id = page[-1]['id']
+
+    one_off = pages(lambda q: q.is_('recurrence', 'null').gte('due_date', first_day.isoformat()).lte('due_date', until.isoformat()))
+    sources = [one_off]
+    if start is None:
+        sources.append(pages(lambda q: q.not_.is_('recurrence', 'null')))
+
+    for source in sources:
+        for task in source:
+            course = task.get('courses') or {}
+            yield Task.from_row(task), course.get('user_id')
+
+
+# Reminders need the service key to load every user's tasks
+scheduler = ReminderScheduler(loader=supabase_loader if os.getenv('SUPABASE_SERVICE_KEY') else None)
+if scheduler.loader is None:
+    print("Reminders disabled: SUPABASE_SERVICE_KEY is not set")
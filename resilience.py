@@ -0,0 +1,267 @@
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FutureTimeout, wait
+
+# Per-operation deadlines in seconds
+READ_TIMEOUT = float(os.getenv('SUPABASE_READ_TIMEOUT', '5'))
+WRITE_TIMEOUT = float(os.getenv('SUPABASE_WRITE_TIMEOUT', '10'))
+
+# Idempotent reads are retried this many times, with full-jitter backoff
+READ_RETRIES = int(os.getenv('SUPABASE_READ_RETRIES', '2'))
+RETRY_BACKOFF_BASE = 0.1
+RETRY_BACKOFF_MAX = 1.0
+
+# Retries may add at most this fraction of extra load, so they can't amplify an outage
+RETRY_BUDGET_RATIO = 0.1
+
+# If set, a read still running after this many milliseconds is sent a second time
+# and whichever response arrives first is used
+HEDGE_AFTER_MS = os.getenv('SUPABASE_HEDGE_AFTER_MS') or None
+if HEDGE_AFTER_MS is not None:
+    if not HEDGE_AFTER_MS.strip().isdigit() or int(HEDGE_AFTER_MS) == 0:
+        raise ValueError(f'SUPABASE_HEDGE_AFTER_MS must be a positive number of milliseconds, got {HEDGE_AFTER_MS!r}')
+    HEDGE_AFTER_MS = int(HEDGE_AFTER_MS)
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('SUPABASE_BREAKER_FAILURES', '5'))
+BREAKER_RESET_SECONDS = float(os.getenv('SUPABASE_BREAKER_RESET_SECONDS', '30'))
+
+# Bounds how many Supabase calls can be waited on at once per worker
+MAX_CONCURRENCY = int(os.getenv('SUPABASE_MAX_CONCURRENCY', '32'))
+
+
+class CircuitOpen(Exception):
+    """Raised without calling Supabase while its circuit breaker is open"""
+
+
+class CallTimeout(Exception):
+    """Raised when a Supabase call misses its deadline"""
+
+
+class PoolTimeout(CallTimeout):
+    """Raised when a call misses its deadline still waiting for a free worker thread"""
+
+
+# MARK: Breaker
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single trial call through
+    once the reset timeout has passed."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.total_failures = 0
+        self.total_rejected = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.total_rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def release(self):
+        """Give up a trial call without judging Supabase either way"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'total_failures': self.total_failures,
+                'total_rejected': self.total_rejected,
+                'retry_in_seconds': retry_in,
+            }
+
+
+class RetryBudget:
+    """Token bucket that earns a fraction of a retry per call"""
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, max_tokens=10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+breakers = {
+    'postgrest': CircuitBreaker('postgrest'),
+    'auth': CircuitBreaker('auth'),
+}
+retry_budget = RetryBudget()
+
+
+def breaker_status():
+    """Breaker state for monitoring"""
+    return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+
+# MARK: Calls
+def _is_backend_failure(error):
+    """True for errors that mean Supabase is slow or down, as opposed to a rejected request"""
+    if isinstance(error, PoolTimeout):
+        # Waiting for our own thread pool says nothing about Supabase
+        return False
+    if isinstance(error, (CallTimeout, ConnectionError, TimeoutError)):
+        return True
+    import httpx  # type: ignore
+    from gotrue.errors import AuthApiError, AuthRetryableError  # type: ignore
+    from postgrest.exceptions import APIError  # type: ignore
+    if isinstance(error, (httpx.TransportError, AuthRetryableError)):
+        return True
+    if isinstance(error, AuthApiError):
+        return (error.status or 500) >= 500
+    if isinstance(error, APIError):
+        code = str(error.code or '')
+        # Responses without a PostgREST error body (e.g. gateway pages) carry no code or the HTTP status
+        if not code:
+            return True
+        if code.isdigit() and len(code) == 3:
+            return int(code) >= 500
+        # Postgres SQLSTATE classes: insufficient resources, operator intervention, system error
+        return code[:2] in ('53', '57', '58')
+    return False
+
+
+def is_unavailable(error):
+    """True if a call failed because Supabase couldn't serve it right now, so it may succeed later"""
+    return isinstance(error, (CircuitOpen, CallTimeout)) or _is_backend_failure(error)
+
+
+def is_auth_error(error):
+    """True if Supabase rejected the caller's token, e.g. because it expired"""
+    from gotrue.errors import AuthApiError  # type: ignore
+    from postgrest.exceptions import APIError  # type: ignore
+    if isinstance(error, AuthApiError):
+        return error.status == 401
+    if isinstance(error, APIError):
+        # PGRST30x: the JWT is missing, expired or otherwise invalid
+        return str(error.code or '') in ('401', 'PGRST301', 'PGRST302', 'PGRST303')
+    return False
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _submit(fn, args, kwargs):
+    global _executor, _executor_pid
+    with _executor_lock:
+        # Created per process so a preloaded app doesn't share the pool across forks
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix='supabase')
+            _executor_pid = os.getpid()
+    # Copy the context so calls made on pool threads still see the Flask request and session
+    ctx = contextvars.copy_context()
+    return _executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+def _attempt(fn, args, kwargs, timeout, hedge):
+    deadline = time.monotonic() + timeout
+    futures = [_submit(fn, args, kwargs)]
+    if hedge:
+        done, _ = wait(futures, timeout=min(timeout, HEDGE_AFTER_MS / 1000))
+        if not done:
+            futures.append(_submit(fn, args, kwargs))
+
+    # The hedge shares the original call's deadline rather than starting a new one
+    done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+    # Calls still queued must not run after the caller has been told the outcome;
+    # cancel() fails only for calls that already started
+    started = [future for future in futures if future not in done and not future.cancel()]
+    if not done:
+        if not started:
+            raise PoolTimeout(f'No worker thread was free within {timeout:g}s')
+        raise CallTimeout(f'Supabase call timed out after {timeout:g}s')
+    winner = done.pop()
+    try:
+        return winner.result(timeout=0)
+    except FutureTimeout:
+        raise CallTimeout(f'Supabase call timed out after {timeout:g}s')
+
+
+def call(fn, *args, breaker='postgrest', read=False, timeout=None, **kwargs):
+    """Call a Supabase client function with a deadline, breaker and, for reads, retries.
+
+    Only pass read=True for idempotent operations; writes are attempted once.
+    """
+    circuit = breakers[breaker]
+    timeout = timeout or (READ_TIMEOUT if read else WRITE_TIMEOUT)
+    attempts = 1 + (READ_RETRIES if read else 0)
+    hedge = read and HEDGE_AFTER_MS is not None
+
+    retry_budget.deposit()
+    for attempt in range(attempts):
+        if not circuit.allow():
+            raise CircuitOpen(f'Supabase {breaker} is unavailable, try again shortly')
+        try:
+            result = _attempt(fn, args, kwargs, timeout, hedge)
+        except Exception as e:
+            if isinstance(e, PoolTimeout):
+                circuit.release()
+                raise
+            if not _is_backend_failure(e):
+                # Supabase answered; the request itself was rejected
+                circuit.record_success()
+                raise
+            circuit.record_failure()
+            if attempt + 1 >= attempts or not retry_budget.withdraw():
+                raise
+            time.sleep(random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt)))
+            continue
+        circuit.record_success()
+        return result
+
+
+def execute(query, read=False, timeout=None):
+    """Execute a postgrest query builder through the resilience layer"""
+    return call(query.execute, breaker='postgrest', read=read, timeout=timeout)
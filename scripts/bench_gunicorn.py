@@ -0,0 +1,132 @@
+"""Compare gunicorn worker models on simulated I/O-bound traffic.
+
+    python scripts/bench_gunicorn.py --latency-ms 50 --concurrency 64 --seconds 10
+
+Each configuration serves a small Flask app whose handler sleeps for
+--latency-ms to stand in for a Supabase round trip, then returns a JSON
+list shaped like /api/tasks. A pool of client threads keeps
+--concurrency requests in flight and the script reports throughput and
+latency percentiles for each worker model.
+"""
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import http.client
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CONFIGS = [
+    ('sync w=4', ['--worker-class', 'sync', '--workers', '4']),
+    ('gthread w=2 t=8', ['--worker-class', 'gthread', '--workers', '2', '--threads', '8']),
+    ('gthread w=2 t=16', ['--worker-class', 'gthread', '--workers', '2', '--threads', '16']),
+    ('gthread w=2 t=32', ['--worker-class', 'gthread', '--workers', '2', '--threads', '32']),
+    ('gthread w=4 t=16', ['--worker-class', 'gthread', '--workers', '4', '--threads', '16']),
+]
+
+
+def create_bench_app():
+    from flask import Flask, jsonify  # type: ignore
+
+    app = Flask(__name__)
+    latency = float(os.getenv('BENCH_LATENCY_MS', '50')) / 1000
+    rows = [{'id': i, 'title': f'Task {i}', 'course_id': 1, 'due_date': '2026-10-20',
+             'priority': 'medium', 'completed': 'Not Started'} for i in range(50)]
+
+    @app.route('/api/tasks')
+    def tasks():
+        time.sleep(latency)
+        return jsonify({'status': 'success', 'tasks': rows})
+
+    return app
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('gunicorn did not start')
+
+
+def run_load(port, concurrency, seconds):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                conn.request('GET', '/api/tasks')
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise RuntimeError(response.status)
+                local.append(time.perf_counter() - started)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ, BENCH_LATENCY_MS=str(args.latency_ms))
+    print(f"simulated backend latency {args.latency_ms:g} ms, {args.concurrency} concurrent clients, {args.seconds:g}s per run")
+    print(f"{'config':<20}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+    for name, options in CONFIGS:
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--chdir', HERE, '--bind', f'127.0.0.1:{port}',
+             '--log-level', 'warning', '--backlog', '2048', *options, 'bench_gunicorn:create_bench_app()'],
+            # Run from scripts/ so the project's gunicorn.conf.py isn't picked up
+            cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_for(port)
+            latencies, errors = run_load(port, args.concurrency, args.seconds)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+        print(f"{name:<20}{len(latencies) / args.seconds:>10.0f}"
+              f"{statistics.median(latencies) * 1000 if latencies else 0:>10.1f}{p99 * 1000:>10.1f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Measure the /api/tasks response path and the cost of holding task rows.
+
+    python scripts/bench_models.py --rows 50000
+
+The handler path starts from a PostgREST response body and ends with the
+JSON sent to the client, comparing the old `select('*')` handler with the
+TASK_LIST projection applied either through Task objects or directly to
+the rows. Time is the best of --repeat runs; peak memory comes from
+tracemalloc on a separate run. The last section compares dicts with
+slotted Task objects for rows that are held long term (the reminder heap).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Task, TASK_LIST
+
+COURSE_NAMES = {i: f'Course {i}' for i in range(40)}
+
+
+def make_rows(count):
+    # Includes the bookkeeping columns a select('*') returns but no endpoint sends back
+    return [{
+        'id': i,
+        'course_id': i % 40,
+        'title': f'Task {i}',
+        'notes': f'Notes for task {i}',
+        'due_date': f'2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+        'priority': ('low', 'medium', 'high')[i % 3],
+        'completed': 'Not Started',
+        'recurrence': None,
+        'description': None,
+        'created_at': f'2026-01-01T00:00:{i % 60:02d}.000000+00:00',
+        'updated_at': f'2026-01-02T00:00:{i % 60:02d}.000000+00:00',
+    } for i in range(count)]
+
+
+def all_columns(body):
+    rows = json.loads(body)
+    for row in rows:
+        row['course_name'] = COURSE_NAMES.get(row['course_id'], 'Unknown Course')
+    return json.dumps(rows)
+
+
+def via_task_objects(body):
+    tasks = [Task.from_row(row) for row in json.loads(body)]
+    return json.dumps([TASK_LIST(task, course_name=COURSE_NAMES.get(task.course_id, 'Unknown Course')) for task in tasks])
+
+
+def projected_rows(body):
+    return json.dumps([TASK_LIST.row(row, course_name=COURSE_NAMES.get(row['course_id'], 'Unknown Course'))
+                       for row in json.loads(body)])
+
+
+def measure(handler, body, repeat):
+    best = min(_timed(handler, body) for _ in range(repeat))
+    tracemalloc.start()
+    output = handler(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, len(output)
+
+
+def _timed(handler, body):
+    started = time.perf_counter()
+    handler(body)
+    return time.perf_counter() - started
+
+
+def held_size(build):
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    wide = json.dumps(rows)
+    narrow = json.dumps([{name: row[name] for name in TASK_LIST.model_fields} for row in rows])
+
+    print(f"/api/tasks with {args.rows} rows: response body -> projection -> JSON")
+    print(f"  {'handler':<34}{'time ms':>10}{'peak MB':>10}{'JSON MB':>10}")
+    for name, handler, body in [
+        ("select('*'), all columns", all_columns, wide),
+        ('TASK_LIST columns, via Task', via_task_objects, narrow),
+        ('TASK_LIST columns, rows projected', projected_rows, narrow),
+    ]:
+        seconds, peak, size = measure(handler, body, args.repeat)
+        print(f"  {name:<34}{seconds * 1000:>10.1f}{peak / 2**20:>10.1f}{size / 2**20:>10.1f}")
+
+    # Both sides share the same string values, so this compares the containers alone
+    print(f"Held long term ({args.rows} rows)")
+    print(f"  dicts:        {held_size(lambda: [dict(row) for row in rows]) / 2**20:6.1f} MB")
+    print(f"  Task objects: {held_size(lambda: [Task.from_row(row) for row in rows]) / 2**20:6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Measure cold start of the app factory in fresh interpreters.
+
+    python scripts/measure_startup.py --runs 10 --max-ms 400
+
+Each run imports main and calls create_app() in a new process, so module
+import cost is included. Exits non-zero if the median exceeds --max-ms,
+which lets CI catch startup regressions (for example a heavy import
+creeping back in at module level).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import time
+started = time.perf_counter()
+import main
+app = main.create_app()
+total = time.perf_counter() - started
+import sys
+print(f"{total * 1000:.3f} {int('supabase' in sys.modules)}")
+"""
+
+
+def measure(runs):
+    env = dict(os.environ)
+    env.setdefault('SUPABASE_URL', 'http://localhost')
+    env.setdefault('SUPABASE_KEY', 'startup-benchmark')
+    env.setdefault('FLASK_DEBUG', 'false')
+
+    timings = []
+    eager_supabase = False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', SNIPPET],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        milliseconds, loaded = output.split()
+        timings.append(float(milliseconds))
+        eager_supabase = eager_supabase or loaded == '1'
+    return timings, eager_supabase
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    timings, eager_supabase = measure(args.runs)
+    median = statistics.median(timings)
+    print(f"create_app() cold start over {args.runs} runs: "
+          f"median {median:.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms")
+    if eager_supabase:
+        print("warning: the supabase package was imported during startup")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"Startup regression: median {median:.1f} ms exceeds {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+-- Server-side course operations. Each function runs as a single transaction
+-- under the caller's role, so the existing RLS policies still apply.
+-- Run this in the Supabase SQL editor.
+
+-- Recurrence rules for tasks (see recurrence.py)
+alter table tasks add column if not exists recurrence text;
+
+-- Archived courses stay visible on request; their tasks move out of the hot tasks table
+alter table courses add column if not exists archived_at timestamptz;
+
+create table if not exists tasks_archive (like tasks including defaults);
+alter table tasks_archive add column if not exists archived_at timestamptz not null default now();
+create index if not exists tasks_archive_course_id_idx on tasks_archive (course_id);
+
+alter table tasks_archive enable row level security;
+
+drop policy if exists "Users manage archived tasks of their courses" on tasks_archive;
+create policy "Users manage archived tasks of their courses" on tasks_archive
+  for all to authenticated
+  using (exists (select 1 from courses where courses.id = tasks_archive.course_id and courses.user_id = auth.uid()))
+  with check (exists (select 1 from courses where courses.id = tasks_archive.course_id and courses.user_id = auth.uid()));
+
+-- Keeps list queries on active tasks ordered by due date cheap
+create index if not exists tasks_course_id_due_date_idx on tasks (course_id, due_date);
+
+
+-- Delete a course and all of its tasks, active and archived. Returns the number of tasks removed.
+create or replace function delete_course_cascade(p_course_id bigint)
+returns integer
+language plpgsql
+as $$
+declare
+  removed integer;
+  removed_archived integer;
+begin
+  if not exists (select 1 from courses where id = p_course_id and user_id = auth.uid()) then
+    raise exception 'Course not found' using errcode = 'P0002';
+  end if;
+
+  delete from tasks where course_id = p_course_id;
+  get diagnostics removed = row_count;
+  delete from tasks_archive where course_id = p_course_id;
+  get diagnostics removed_archived = row_count;
+  delete from courses where id = p_course_id;
+
+  return removed + removed_archived;
+end;
+$$;
+
+
+-- Archive a course: its tasks move to tasks_archive. Returns the number of tasks moved.
+create or replace function archive_course(p_course_id bigint)
+returns integer
+language plpgsql
+as $$
+declare
+  moved integer;
+begin
+  if not exists (select 1 from courses where id = p_course_id and user_id = auth.uid()) then
+    raise exception 'Course not found' using errcode = 'P0002';
+  end if;
+
+  -- Columns are matched by name, so columns added to tasks later can't shift them
+  with removed as (
+    delete from tasks where course_id = p_course_id returning *
+  )
+  insert into tasks_archive
+  select (jsonb_populate_record(null::tasks_archive, to_jsonb(removed) || jsonb_build_object('archived_at', now()))).*
+  from removed;
+  get diagnostics moved = row_count;
+
+  update courses set archived_at = now() where id = p_course_id;
+
+  return moved;
+end;
+$$;
+
+
+-- Restore an archived course and move its tasks back. Returns the restored tasks.
+create or replace function restore_course(p_course_id bigint)
+returns setof tasks
+language plpgsql
+as $$
+begin
+  if not exists (select 1 from courses where id = p_course_id and user_id = auth.uid()) then
+    raise exception 'Course not found' using errcode = 'P0002';
+  end if;
+
+  update courses set archived_at = null where id = p_course_id;
+
+  return query
+  with removed as (
+    delete from tasks_archive where course_id = p_course_id returning *
+  )
+  insert into tasks
+  select (jsonb_populate_record(null::tasks, to_jsonb(removed) - 'archived_at')).*
+  from removed
+  returning *;
+end;
+$$;
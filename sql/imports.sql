@@ -0,0 +1,14 @@
+-- Bulk import bookkeeping (see transfer.import_records and jobs.run_import).
+-- Run this in the Supabase SQL editor after course_operations.sql.
+
+-- Imported rows remember the job and file line they came from. A retried
+-- batch is upserted on this pair, so rows from an insert that timed out but
+-- still committed are not stored twice. Rows created in the app leave both
+-- null, and nulls never conflict.
+alter table tasks add column if not exists import_id text;
+alter table tasks add column if not exists import_line integer;
+create unique index if not exists tasks_import_line_idx on tasks (import_id, import_line);
+
+alter table tasks_archive add column if not exists import_id text;
+alter table tasks_archive add column if not exists import_line integer;
+create unique index if not exists tasks_archive_import_line_idx on tasks_archive (import_id, import_line);
@@ -1,8 +1,15 @@
+from __future__ import annotations
+
 import os
+from typing import TYPE_CHECKING
 from flask import g  #type: ignore
 from werkzeug.local import LocalProxy #type: ignore
-from supabase.client import Client, ClientOptions #type: ignore
-from flask_storage import FlaskSessionStorage
+from resilience import WRITE_TIMEOUT
+
+# The supabase package pulls in httpx, pydantic and gotrue, which dominate
+# startup time, so it is only imported when the first client is created
+if TYPE_CHECKING:
+    from supabase.client import Client #type: ignore
 
 # Global singleton client
 _supabase_client = None
@@ -10,6 +17,9 @@ _supabase_client = None
 def get_supabase() -> Client:
     global _supabase_client
     if _supabase_client is None:
+        from supabase.client import Client, ClientOptions #type: ignore
+        from flask_storage import FlaskSessionStorage
+        
         url = os.environ.get("SUPABASE_URL", "")
         key = os.environ.get("SUPABASE_KEY", "")
         
@@ -21,10 +31,47 @@ def get_supabase() -> Client:
             key,
             options=ClientOptions(
                 storage=FlaskSessionStorage(),
-                flow_type="pkce"
+                flow_type="pkce",
+                # Keep the HTTP timeout in line with the longest call deadline
+                postgrest_client_timeout=WRITE_TIMEOUT
             ),
         )
     return _supabase_client
 
 # Use lazy initialization - only create when first accessed
 supabase: Client = LocalProxy(get_supabase)
+
+def create_user_client(access_token: str) -> Client:
+    """Create a standalone client that acts as a user outside of a request.
+
+    Background work has no Flask session to read tokens from, so the client
+    keeps its own in-memory auth storage and sends the given access token.
+    RLS policies then apply exactly as they do for the user's own requests.
+    """
+    from supabase.client import Client, ClientOptions #type: ignore
+
+    url = os.environ.get("SUPABASE_URL", "")
+    key = os.environ.get("SUPABASE_KEY", "")
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables are required")
+
+    client = Client(url, key, options=ClientOptions(persist_session=False, postgrest_client_timeout=WRITE_TIMEOUT))
+    client.postgrest.auth(access_token)
+    return client
+
+def create_service_client() -> Client:
+    """Create a client with the service role key for server-side maintenance.
+
+    This bypasses RLS, so it is only used by background components that work
+    across all users (such as the reminder scheduler), never for requests.
+    """
+    from supabase.client import Client, ClientOptions #type: ignore
+
+    url = os.environ.get("SUPABASE_URL", "")
+    key = os.environ.get("SUPABASE_SERVICE_KEY", "")
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables are required")
+
+    return Client(url, key, options=ClientOptions(persist_session=False, postgrest_client_timeout=WRITE_TIMEOUT))
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import jobs
+
+done = threading.Event()
+
+
+@jobs.job_handler('test-echo')
+def echo(ctx, payload):
+    done.set()
+    return payload
+
+
+@jobs.job_handler('test-expired')
+def expired(ctx, payload):
+    raise jobs.JobFailed('Your session expired')
+
+
+started = threading.Event()
+
+
+@jobs.job_handler('test-long')
+def long_running(ctx, payload):
+    started.set()
+    for step in range(500):
+        ctx.save_checkpoint({'step': step})
+        ctx.progress(step)
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return jobs.JobStore(str(tmp_path / 'jobs.db'))
+
+
+@pytest.mark.skipif(jobs._process_started(os.getpid()) is None, reason='needs /proc')
+def test_job_owned_by_a_reused_pid_is_recovered(store):
+    # Same pid as a live process, but that process started after the owner did
+    pid, started = jobs._owner()
+    job_id = store.create('test-echo', 'user-1', {'n': 1}, 3)
+    store.update(job_id, status=jobs.RUNNING, attempts=1, owner_pid=pid, owner_started=started - 1)
+    done.clear()
+
+    jobs.JobQueue(store=store).ensure_started()
+
+    assert done.wait(5)
+    assert store.get(job_id)['attempts'] == 2
+
+
+def test_job_owned_by_a_live_process_is_left_alone(store):
+    pid, started = jobs._owner()
+    job_id = store.create('test-echo', 'user-1', {'n': 1}, 3)
+    store.update(job_id, status=jobs.RUNNING, attempts=1, owner_pid=pid, owner_started=started)
+
+    assert store.orphaned() == []
+    assert os.getpid() == store.get(job_id)['owner_pid']
+
+
+def test_job_failed_is_not_retried(store):
+    job_id = store.create('test-expired', 'user-1', {}, 3)
+    jobs.JobQueue(store=store)._run(job_id)
+
+    job = store.get(job_id)
+    assert (job['status'], job['attempts'], job['error']) == (jobs.FAILED, 1, 'Your session expired')
+
+
+def test_shutdown_gives_the_attempt_back(store):
+    queue = jobs.JobQueue(store=store)
+    started.clear()
+    job_id = queue.enqueue('test-long', 'user-1', {})
+    assert started.wait(5)
+
+    queue.shutdown(timeout=5)
+
+    job = store.get(job_id)
+    assert (job['status'], job['attempts'], job['owner_pid']) == (jobs.RETRYING, 0, os.getpid())
+    assert json.loads(job['checkpoint'])['step'] < 499
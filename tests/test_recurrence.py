@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+import pytest
+
+from recurrence import WEEKDAYS, occurrences, parse_rule
+
+ANCHOR = date(2026, 3, 4)  # a Wednesday
+
+
+def expand(anchor, rule, end):
+    """Walk the series one day at a time from the anchor, for comparison"""
+    week0 = anchor - timedelta(days=anchor.weekday())
+    days = rule.byday or (anchor.weekday(),)
+    found = []
+    current = anchor
+    while current <= end and (rule.until is None or current <= rule.until):
+        if rule.count is not None and len(found) >= rule.count:
+            break
+        if rule.freq == 'DAILY':
+            matches = (current - anchor).days % rule.interval == 0
+        else:
+            matches = ((current - week0).days // 7) % rule.interval == 0 and current.weekday() in days
+        if matches:
+            found.append(current)
+        current += timedelta(days=1)
+    return found
+
+
+@pytest.mark.parametrize('text', [
+    'daily',
+    'FREQ=DAILY;INTERVAL=3',
+    'FREQ=DAILY;COUNT=10',
+    'weekly',
+    'FREQ=WEEKLY;INTERVAL=2',
+    'FREQ=WEEKLY;BYDAY=MO,WE,FR',
+    'FREQ=WEEKLY;BYDAY=MO,TU',
+    'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;COUNT=7',
+    'FREQ=WEEKLY;INTERVAL=3;BYDAY=SU;UNTIL=20260601',
+    'FREQ=DAILY;INTERVAL=2;UNTIL=20260320',
+])
+def test_windows_match_a_day_by_day_walk(text):
+    rule = parse_rule(text)
+    series = expand(ANCHOR, rule, date(2026, 9, 1))
+    # Windows before the anchor, across it, and starting part way through a period
+    for start_offset in (-10, 0, 1, 5, 13, 30, 61):
+        for length in (0, 3, 6, 20, 90):
+            start = ANCHOR + timedelta(days=start_offset)
+            end = start + timedelta(days=length)
+            expected = [day for day in series if start <= day <= end]
+            assert list(occurrences(ANCHOR, rule, start, end)) == expected, (text, start, end)
+
+
+def test_byday_before_the_anchor_is_skipped_in_the_first_week():
+    rule = parse_rule('FREQ=WEEKLY;BYDAY=MO,WE,FR')
+    dates = list(occurrences(ANCHOR, rule, ANCHOR, ANCHOR + timedelta(days=7)))
+
+    assert [WEEKDAYS[day.weekday()] for day in dates] == ['WE', 'FR', 'MO', 'WE']
+
+
+def test_count_spans_periods():
+    rule = parse_rule('FREQ=WEEKLY;BYDAY=TU,TH;COUNT=3')
+    # Wednesday anchor: Thursday this week, then Tuesday and Thursday next week
+    dates = list(occurrences(ANCHOR, rule, date(2026, 3, 10), date(2026, 12, 31)))
+
+    assert dates == [date(2026, 3, 10), date(2026, 3, 12)]
+
+
+def test_until_is_inclusive():
+    rule = parse_rule('FREQ=DAILY;UNTIL=20260306')
+
+    assert list(occurrences(ANCHOR, rule, ANCHOR, date(2026, 12, 31))) == [
+        date(2026, 3, 4), date(2026, 3, 5), date(2026, 3, 6)]
+
+
+def test_interval_skips_weeks():
+    rule = parse_rule('FREQ=WEEKLY;INTERVAL=2')
+
+    assert list(occurrences(ANCHOR, rule, date(2026, 3, 5), date(2026, 4, 1))) == [
+        date(2026, 3, 18), date(2026, 4, 1)]
+
+
+@pytest.mark.parametrize('value', [1, 2.5, True, ['weekly'], {'freq': 'weekly'}])
+def test_non_string_recurrence_is_rejected(value):
+    with pytest.raises(ValueError):
+        parse_rule(value)
+
+
+@pytest.mark.parametrize('value', [None, '', '   '])
+def test_empty_recurrence_is_a_one_off(value):
+    assert parse_rule(value) is None
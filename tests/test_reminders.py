@@ -0,0 +1,109 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+import reminders
+from models import Task
+
+
+@pytest.fixture
+def notifier():
+    return reminders.MemoryNotifier()
+
+
+def make_scheduler(tmp_path, notifier, tasks):
+    def loader(start, until):
+        if start is None:
+            yield from ((task, 'user-1') for task in tasks)
+
+    return reminders.ReminderScheduler(notifier=notifier, loader=loader, path=str(tmp_path / 'reminders.db'))
+
+
+def weekly(task_id, due):
+    return Task(task_id, 1, f'Task {task_id}', None, due.isoformat(), None, 'Not Started', 'weekly')
+
+
+def test_next_due_for_series_starting_far_ahead():
+    due = date.today() + timedelta(days=30)
+    assert reminders.next_due(weekly(1, due), date.today()) == due
+
+
+def test_next_due_after_series_ends():
+    task = Task(1, 1, 'Ended', None, '2026-01-05', None, 'Not Started', 'FREQ=WEEKLY;COUNT=2')
+    assert reminders.next_due(task, date(2026, 1, 13)) is None
+
+
+def test_series_beyond_the_window_is_queued(tmp_path, notifier):
+    due = date.today() + timedelta(days=30)
+    scheduler = make_scheduler(tmp_path, notifier, [weekly(1, due)])
+    scheduler._extend_window()
+
+    assert scheduler.queue.entries['1'][2].due_date == due.isoformat()
+
+
+def test_moving_series_far_out_keeps_its_reminder(tmp_path, notifier):
+    scheduler = make_scheduler(tmp_path, notifier, [])
+    scheduler._extend_window()
+    due = date.today() + timedelta(days=45)
+    scheduler.add(weekly(2, due), 'user-1')
+
+    assert scheduler.queue.entries['2'][2].due_date == due.isoformat()
+
+
+def test_one_off_beyond_the_window_waits_for_the_window(tmp_path, notifier):
+    scheduler = make_scheduler(tmp_path, notifier, [])
+    scheduler._extend_window()
+    due = date.today() + timedelta(days=30)
+    scheduler.add(Task(3, 1, 'Later', None, due.isoformat(), None, 'Not Started'), 'user-1')
+
+    assert '3' not in scheduler.queue.entries
+
+
+def test_fired_series_queues_its_next_occurrence(tmp_path, notifier):
+    today = date.today()
+    scheduler = make_scheduler(tmp_path, notifier, [weekly(4, today - timedelta(days=7))])
+    scheduler._extend_window()
+    scheduler._fire_due(time.time() + 2 * 86400)
+
+    assert [(sent['task_id'], sent['due_date'], sent['user_id']) for sent in notifier.sent] == [(4, today.isoformat(), 'user-1')]
+    assert scheduler.queue.entries['4'][2].due_date == (today + timedelta(days=7)).isoformat()
+
+
+def test_reminder_is_sent_once_per_occurrence(tmp_path, notifier):
+    today = date.today()
+    task = Task(5, 1, 'Once', None, today.isoformat(), None, 'Not Started')
+    scheduler = make_scheduler(tmp_path, notifier, [task])
+    scheduler._extend_window()
+    scheduler._fire_due(time.time() + 86400)
+    scheduler.add(task, 'user-1')
+    scheduler._fire_due(time.time() + 86400)
+
+    assert len(notifier.sent) == 1
+
+
+def test_concurrent_starts_run_one_scheduler_thread(tmp_path, notifier, monkeypatch):
+    started = []
+
+    class SlowThread(threading.Thread):
+        # Widens the gap between checking for a scheduler thread and recording it
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.01)
+            super().__init__(*args, **kwargs)
+
+        def start(self):
+            started.append(self)
+            super().start()
+
+    scheduler = make_scheduler(tmp_path, notifier, [])
+    threads = [threading.Thread(target=scheduler.ensure_started) for _ in range(8)]
+    monkeypatch.setattr(reminders.threading, 'Thread', SlowThread)
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    monkeypatch.undo()
+    scheduler.stop()
+
+    assert len(started) == 1
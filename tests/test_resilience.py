@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import resilience
+
+
+def test_hedged_read_keeps_the_original_deadline(monkeypatch):
+    monkeypatch.setattr(resilience, 'HEDGE_AFTER_MS', 200)
+
+    started = time.monotonic()
+    with pytest.raises(resilience.CallTimeout):
+        resilience._attempt(time.sleep, (1,), {}, 0.5, hedge=True)
+
+    assert time.monotonic() - started < 0.7
+
+
+@pytest.mark.parametrize('value', ['abc', '1.5', '0', '-10'])
+def test_bad_hedge_setting_fails_at_import(value):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, SUPABASE_HEDGE_AFTER_MS=value)
+    imported = subprocess.run([sys.executable, '-c', 'import resilience'], cwd=root, env=env,
+                              capture_output=True, text=True)
+
+    assert imported.returncode != 0
+    assert 'SUPABASE_HEDGE_AFTER_MS' in imported.stderr
@@ -0,0 +1,182 @@
+from types import SimpleNamespace
+
+import pytest
+from postgrest.exceptions import APIError  # type: ignore
+
+import transfer
+from resilience import CallTimeout
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.rows = None
+        self.on_conflict = None
+        self.after = None
+        self.page_size = None
+
+    def select(self, columns='*'):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def gt(self, column, value):
+        self.after = value
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, count):
+        self.page_size = count
+        return self
+
+    def insert(self, rows):
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict=''):
+        self.on_conflict = on_conflict.split(',')
+        return self.insert(rows)
+
+    def execute(self):
+        stored = self.client.tables.setdefault(self.table, [])
+        if self.rows is None:
+            rows = [dict(row) for row in stored if all(row.get(column) == value for column, value in self.filters)
+                    and (self.after is None or row['id'] > self.after)]
+            return SimpleNamespace(data=rows[:self.page_size])
+        return SimpleNamespace(data=self.client.write(self, stored))
+
+
+class FakeClient:
+    """Just enough of the Supabase client for import_records"""
+
+    def __init__(self):
+        self.tables = {'courses': [{'id': 1, 'name': 'Math', 'user_id': 'user-1'}]}
+        # Called with each tasks write; may raise to simulate Supabase failures
+        self.before_write = None
+        self.after_write = None
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def write(self, query, stored):
+        if query.table == 'tasks' and self.before_write:
+            self.before_write(query.rows)
+        written = []
+        for row in query.rows:
+            existing = None
+            if query.on_conflict:
+                key = [row.get(column) for column in query.on_conflict]
+                existing = next((r for r in stored if [r.get(c) for c in query.on_conflict] == key), None)
+            if existing is not None:
+                existing.update(row)
+                written.append(dict(existing))
+                continue
+            stored.append(dict(row, id=len(stored) + 1))
+            written.append(dict(stored[-1]))
+        if query.table == 'tasks' and self.after_write:
+            self.after_write(query.rows)
+        return written
+
+
+def records(count, start=1):
+    return [(line, {'title': f'Task {line}', 'course_id': 1, 'due_date': '2026-11-01'})
+            for line in range(start, start + count)]
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+def test_import_inserts_in_batches(client):
+    result = transfer.import_records(client, 'user-1', records(12), batch_size=5)
+
+    assert (result.imported, result.failed) == (12, 0)
+    assert len(client.tables['tasks']) == 12
+
+
+def test_retried_batch_that_committed_is_stored_once(client):
+    state = {'timed_out': False}
+
+    def time_out_once(rows):
+        # The second batch commits, but the caller only sees a timeout
+        if rows[0]['import_line'] == 6 and not state['timed_out']:
+            state['timed_out'] = True
+            raise CallTimeout('Supabase call timed out')
+
+    client.after_write = time_out_once
+    checkpoints = []
+    with pytest.raises(CallTimeout):
+        transfer.import_records(client, 'user-1', records(12), batch_size=5, import_id='job-1',
+                                on_progress=lambda result: checkpoints.append(result.to_checkpoint()))
+
+    resume = transfer.ImportResult.from_checkpoint(checkpoints[-1])
+    result = transfer.import_records(client, 'user-1', records(12), batch_size=5, import_id='job-1', resume=resume)
+
+    assert result.imported == 12
+    assert sorted(task['import_line'] for task in client.tables['tasks']) == list(range(1, 13))
+
+
+def test_expired_token_stops_the_import(client):
+    def reject(rows):
+        raise APIError({'code': 'PGRST301', 'message': 'JWT expired'})
+
+    client.before_write = reject
+    with pytest.raises(APIError):
+        transfer.import_records(client, 'user-1', records(3))
+
+
+def test_rejected_row_does_not_fail_its_batch(client):
+    def check(rows):
+        if any(row['title'] == 'Task 4' for row in rows):
+            raise APIError({'code': '23514', 'message': 'new row violates check constraint'})
+
+    client.before_write = check
+    result = transfer.import_records(client, 'user-1', records(10), batch_size=5)
+
+    assert (result.imported, result.failed) == (9, 1)
+    assert result.errors[0]['line'] == 4
+    assert len(client.tables['tasks']) == 9
+
+
+def test_unknown_priority_is_rejected_before_insert(client):
+    lines = records(3)
+    lines[1][1]['priority'] = 'bogus'
+    result = transfer.import_records(client, 'user-1', lines)
+
+    assert (result.imported, result.failed) == (2, 1)
+
+
+def test_archived_tasks_are_restored_to_the_archive(client):
+    lines = [
+        (1, {'type': 'course', 'id': 7, 'name': 'History', 'archived_at': '2026-06-01T00:00:00+00:00'}),
+        (2, {'type': 'task', 'title': 'Essay', 'course_id': 7, 'due_date': '2026-05-01',
+             'archived': True, 'archived_at': '2026-06-01T00:00:00+00:00'}),
+        (3, {'type': 'task', 'title': 'Reading', 'course_id': 1, 'due_date': '2026-11-01'}),
+    ]
+    result = transfer.import_records(client, 'user-1', lines, import_id='job-1')
+
+    assert (result.imported, result.failed) == (2, 0)
+    course = client.tables['courses'][-1]
+    assert course['archived_at'] == '2026-06-01T00:00:00+00:00'
+    [archived] = client.tables['tasks_archive']
+    assert (archived['title'], archived['course_id']) == ('Essay', course['id'])
+    assert [task['title'] for task in client.tables['tasks']] == ['Reading']
+
+
+def test_ics_series_start_on_their_due_date(client):
+    client.tables['tasks'] = [
+        {'id': 1, 'title': 'Quiz', 'course_id': 1, 'due_date': '2026-11-02', 'recurrence': 'FREQ=WEEKLY'},
+        {'id': 2, 'title': 'Essay', 'course_id': 1, 'due_date': '2026-11-05', 'recurrence': None},
+    ]
+    quiz, essay = ''.join(transfer.export_ics(client)).split('END:VTODO')[:2]
+
+    assert 'DTSTART;VALUE=DATE:20261102\r\nDUE;VALUE=DATE:20261102' in quiz
+    assert 'RRULE:FREQ=WEEKLY' in quiz
+    assert 'DTSTART' not in essay
@@ -0,0 +1,364 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timezone
+
+from models import COURSE_NAME, TASK_EXPORT
+from recurrence import parse_rule
+from resilience import execute, is_auth_error, is_unavailable
+
+# Rows fetched per page when exporting; keeps memory flat for large accounts
+EXPORT_PAGE_SIZE = 1000
+
+# Rows sent per insert when importing
+IMPORT_BATCH_SIZE = 500
+
+# Stop collecting per-row errors after this many so a bad file can't blow up the response
+MAX_REPORTED_ERRORS = 1000
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'ics': ('text/calendar', 'ics'),
+}
+
+
+# MARK: Export
+def iter_table(client, table, columns='*', page_size=EXPORT_PAGE_SIZE):
+    """Yield every visible row of a table using keyset pagination on id"""
+    last_id = None
+    while True:
+        query = client.table(table).select(columns)
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        page = execute(query.order('id').limit(page_size), read=True).data
+        yield from page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]['id']
+
+
+def _course_names(client):
+    return {course['id']: course['name'] for course in iter_table(client, 'courses', COURSE_NAME.columns)}
+
+
+def export_csv(client):
+    """Stream the user's tasks as CSV, one course_name column per task"""
+    names = _course_names(client)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=TASK_EXPORT.field_names)
+
+    writer.writeheader()
+    for task in iter_table(client, 'tasks', TASK_EXPORT.columns):
+        writer.writerow(TASK_EXPORT.row(task, course_name=names.get(task['course_id'], '')))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_ndjson(client):
+    """Stream courses and then tasks, including archived ones, as newline-delimited JSON records"""
+    # Full rows, so a backup round-trips every column
+    for course in iter_table(client, 'courses'):
+        yield json.dumps(dict(course, type='course'), default=str) + '\n'
+    for task in iter_table(client, 'tasks'):
+        yield json.dumps(dict(task, type='task'), default=str) + '\n'
+    for task in iter_table(client, 'tasks_archive'):
+        yield json.dumps(dict(task, type='task', archived=True), default=str) + '\n'
+
+
+def _ics_escape(value):
+    return str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _ics_fold(line):
+    # RFC 5545 limits content lines to 75 octets; continuation lines start with a space
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+ICS_PRIORITY = {'high': 1, 'medium': 5, 'low': 9}
+
+
+def export_ics(client):
+    """Stream the user's tasks as an iCalendar file of VTODO entries"""
+    names = _course_names(client)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    yield 'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Tasksmith//Tasks//EN\r\n'
+    for task in iter_table(client, 'tasks', TASK_EXPORT.columns):
+        lines = [
+            'BEGIN:VTODO',
+            f"UID:task-{task['id']}@tasksmith",
+            f'DTSTAMP:{stamp}',
+            f"SUMMARY:{_ics_escape(task.get('title') or '')}",
+        ]
+        if task.get('notes'):
+            lines.append(f"DESCRIPTION:{_ics_escape(task['notes'])}")
+        if task.get('course_id') in names:
+            lines.append(f"CATEGORIES:{_ics_escape(names[task['course_id']])}")
+        rrule = None
+        if task.get('recurrence') and task.get('due_date'):
+            try:
+                rrule = parse_rule(task['recurrence']).to_rrule()
+            except ValueError:
+                pass
+        if task.get('due_date'):
+            due = task['due_date'][:10].replace('-', '')
+            if rrule:
+                # An RRULE repeats DTSTART, so a series needs one; its first occurrence is the due date
+                lines.append(f'DTSTART;VALUE=DATE:{due}')
+            lines.append(f'DUE;VALUE=DATE:{due}')
+        if str(task.get('priority', '')).lower() in ICS_PRIORITY:
+            lines.append(f"PRIORITY:{ICS_PRIORITY[str(task['priority']).lower()]}")
+        if rrule:
+            lines.append(f'RRULE:{rrule}')
+        lines.append('END:VTODO')
+        yield ''.join(_ics_fold(line) for line in lines)
+    yield 'END:VCALENDAR\r\n'
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+    'ics': export_ics,
+}
+
+
+# MARK: Import
+def iter_csv_records(stream):
+    """Yield (line_number, record) pairs from a binary CSV upload"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def iter_ndjson_records(stream):
+    """Yield (line_number, record) pairs from a binary NDJSON upload"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig')
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f'Invalid JSON: {str(e)}')
+            continue
+        if not isinstance(record, dict):
+            yield line_number, ValueError('Each line must be a JSON object')
+            continue
+        yield line_number, record
+
+
+IMPORT_READERS = {
+    'csv': iter_csv_records,
+    'ndjson': iter_ndjson_records,
+}
+
+
+def _task_row(record):
+    """Validate an imported record and build the row to insert"""
+    title = (record.get('title') or record.get('taskTitle') or '').strip()
+    if not title:
+        raise ValueError('Task title is required')
+
+    due_date = record.get('due_date') or record.get('dueDate')
+    if due_date:
+        due_date = date.fromisoformat(str(due_date)[:10]).isoformat()
+    else:
+        # Same default as creating a task through the API
+        due_date = date.fromordinal(date.today().toordinal() + 1).isoformat()
+
+    priority = record.get('priority') or 'medium'
+    if priority not in ('low', 'medium', 'high'):
+        raise ValueError('Priority must be low, medium or high')
+
+    recurrence = record.get('recurrence') or None
+    parse_rule(recurrence)
+
+    return {
+        'title': title,
+        'notes': record.get('notes') or '',
+        'course_id': None,
+        'due_date': due_date,
+        'priority': priority,
+        'completed': record.get('completed') or 'Not Started',
+        'recurrence': recurrence,
+    }
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.courses_created = 0
+        self.failed = 0
+        self.errors = []
+        # Line number of the last record handled by a completed batch
+        self.last_line = 0
+        # Course ids from NDJSON course records, mapped to the courses created for them
+        self.remapped_ids = {}
+
+    def error(self, line_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'error': message})
+
+    def to_dict(self):
+        return {
+            'imported': self.imported,
+            'courses_created': self.courses_created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+    def to_checkpoint(self):
+        """State needed to resume an import after the last completed batch"""
+        return dict(self.to_dict(), last_line=self.last_line, remapped_ids=self.remapped_ids)
+
+    @classmethod
+    def from_checkpoint(cls, state):
+        result = cls()
+        for name in ('imported', 'courses_created', 'failed', 'errors', 'last_line', 'remapped_ids'):
+            setattr(result, name, state[name])
+        return result
+
+
+def import_records(client, user_id, records, batch_size=IMPORT_BATCH_SIZE, on_progress=None, on_inserted=None,
+                   resume=None, import_id=None):
+    """Insert parsed records for a user in batches, collecting per-row errors.
+
+    Course ownership is looked up once up front; tasks may reference a course
+    by id (one the user owns, or an id from an imported NDJSON course record)
+    or by name, in which case a missing course is created once and reused.
+
+    Errors that mean Supabase is unavailable, or that the token was rejected,
+    are raised rather than recorded against rows, so the caller can retry or
+    stop; pass the last checkpointed ImportResult as `resume` to skip the
+    records it already covers. A timed
+    out insert may still have committed, so retried imports must pass an
+    `import_id`: rows are then upserted on (import_id, import_line) and a
+    batch that is sent twice is only stored once (see sql/imports.sql).
+    """
+    result = resume or ImportResult()
+    remapped_ids = result.remapped_ids
+
+    courses = execute(client.table('courses').select('id, name').eq('user_id', user_id), read=True).data
+    owned_ids = {course['id'] for course in courses}
+    ids_by_name = {course['name']: course['id'] for course in courses}
+
+    def create_course(name, description='', archived_at=None):
+        course = {
+            'name': name,
+            'description': description,
+            'user_id': user_id,
+        }
+        if archived_at:
+            course['archived_at'] = archived_at
+        created = execute(client.table('courses').insert(course)).data[0]
+        owned_ids.add(created['id'])
+        ids_by_name[name] = created['id']
+        result.courses_created += 1
+        return created['id']
+
+    def resolve_course(record):
+        raw_id = record.get('course_id') or record.get('courseId')
+        if raw_id not in (None, ''):
+            if str(raw_id) in remapped_ids:
+                return remapped_ids[str(raw_id)]
+            course_id = int(raw_id)
+            if course_id in owned_ids:
+                return course_id
+        name = (record.get('course_name') or '').strip()
+        if name:
+            return ids_by_name.get(name) or create_course(name)
+        raise ValueError('You can only import tasks for your own courses')
+
+    # Archived tasks from an NDJSON backup go back to tasks_archive
+    batches = {'tasks': [], 'tasks_archive': []}
+
+    def write(table, rows):
+        if import_id:
+            query = client.table(table).upsert(rows, on_conflict='import_id,import_line')
+        else:
+            query = client.table(table).insert(rows)
+        inserted = execute(query).data
+        result.imported += len(rows)
+        if on_inserted and table == 'tasks':
+            on_inserted(inserted)
+
+    def flush():
+        for table, batch in batches.items():
+            if not batch:
+                continue
+            try:
+                write(table, [row for _, row in batch])
+            except Exception as e:
+                if is_unavailable(e) or is_auth_error(e):
+                    raise
+                # A batch is written in one statement, so nothing was stored; find
+                # the rows Postgres rejected by writing them one at a time
+                for line_number, row in batch:
+                    try:
+                        write(table, [row])
+                    except Exception as row_error:
+                        if is_unavailable(row_error) or is_auth_error(row_error):
+                            raise
+                        result.error(line_number, f'Insert failed: {str(row_error)}')
+            batch.clear()
+        result.last_line = last_line
+        if on_progress:
+            on_progress(result)
+
+    last_line = result.last_line
+    for line_number, record in records:
+        if line_number <= result.last_line:
+            # Handled before the checkpoint this import resumed from
+            continue
+        last_line = line_number
+        if isinstance(record, Exception):
+            result.error(line_number, str(record))
+            continue
+        try:
+            if record.get('type') == 'course':
+                name = (record.get('name') or '').strip()
+                if not name:
+                    raise ValueError('Course name is required')
+                new_id = ids_by_name.get(name) or create_course(name, record.get('description') or '',
+                                                                record.get('archived_at'))
+                if record.get('id') is not None:
+                    remapped_ids[str(record['id'])] = new_id
+                continue
+            row = _task_row(record)
+            row['course_id'] = resolve_course(record)
+            if import_id:
+                row['import_id'] = import_id
+                row['import_line'] = line_number
+            if record.get('archived'):
+                if record.get('archived_at'):
+                    row['archived_at'] = record['archived_at']
+                batches['tasks_archive'].append((line_number, row))
+            else:
+                batches['tasks'].append((line_number, row))
+        except Exception as e:
+            if is_unavailable(e) or is_auth_error(e):
+                raise
+            result.error(line_number, str(e))
+            continue
+        if sum(len(batch) for batch in batches.values()) >= batch_size:
+            flush()
+    flush()
+
+    return result